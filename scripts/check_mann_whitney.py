@@ -0,0 +1,51 @@
+"""
+Compare the NumPy Mann-Whitney fallback in hypothesis_tests with scipy.
+
+Covers small, lopsided and large samples, including lopsided ones that take
+the exact U distribution path. Exits non-zero if any p-value differs from
+scipy.stats.mannwhitneyu by more than the tolerance.
+
+    python scripts/check_mann_whitney.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy import stats
+
+# Add src directory to path
+src_dir = Path(__file__).resolve().parents[1] / "src"
+if str(src_dir) not in sys.path:
+    sys.path.insert(0, str(src_dir))
+
+from analysis.hypothesis_tests import mann_whitney_numpy
+
+TOLERANCE = 1e-9
+
+CASES = {
+    "small": (6, 7),
+    "lopsided": (5, 1500),
+    "lopsided_reversed": (1500, 5),
+    "exact_limit": (8, 2500),
+    "large": (40, 60),
+}
+
+
+def main(seed: int = 0) -> int:
+    rng = np.random.default_rng(seed)
+    failures = 0
+    for name, (n1, n2) in CASES.items():
+        x, y = rng.normal(size=n1), rng.normal(0.3, size=n2)
+        _, p = mann_whitney_numpy(x.tolist(), y.tolist())
+        expected = float(stats.mannwhitneyu(x, y, alternative="two-sided").pvalue)
+        diff = abs(p - expected)
+        failures += diff > TOLERANCE
+        print(f"  {name:<20} p={p:.6g}  scipy={expected:.6g}  |diff|={diff:.2e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
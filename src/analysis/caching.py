@@ -0,0 +1,26 @@
+"""
+Shared helpers for the in-process analysis caches.
+
+Caches in lexical_diversity and hypothesis_tests are keyed by the corpus they
+were computed from, so edits to any track invalidate them. Serializing the
+whole corpus is not free, so callers that loaded it from disk key on the
+export file's path, size and modification time instead and only fall back to
+hashing the content for data that came from elsewhere.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Any
+
+
+def corpus_fingerprint(data: List[Dict[str, Any]]) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def file_fingerprint(path: Path) -> str:
+    stat = Path(path).stat()
+    return f"file:{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
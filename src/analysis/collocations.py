@@ -0,0 +1,146 @@
+"""
+Collocation Statistics for Radiohead Lyrics.
+
+Signature phrases per era or album, complementing extract_keywords_by_album:
+
+- Adjacent content-word bigrams from the shared LyricCorpus token stream
+  (never across track boundaries)
+- Pointwise mutual information (PMI), which favours tight but rare pairings
+- Dunning's log-likelihood ratio (G^2), which favours well-attested ones
+
+All groups are counted at once: bigrams and their left/right marginals are
+integer (group, term, term) keys tallied with one sort, so there is no
+per-album Counter and the cost stays near-linear in corpus size.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Any
+
+import numpy as np
+
+from analysis.topic_modeling import LyricCorpus, load_data
+
+
+def _xlogx_ratio(k: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    # k * log(k / E), with 0 * log 0 = 0
+    out = np.zeros_like(k, dtype=float)
+    mask = k > 0
+    out[mask] = k[mask] * np.log(k[mask] / expected[mask])
+    return out
+
+
+def bigram_statistics(corpus: LyricCorpus, group_of_doc: np.ndarray | None = None) -> Dict[str, np.ndarray]:
+    if group_of_doc is None:
+        group_of_doc = np.zeros(corpus.n_docs, dtype=np.int64)
+    n_terms = max(corpus.n_terms, 1)
+
+    ids, docs = corpus.token_ids, corpus.doc_of_token
+    same_doc = docs[:-1] == docs[1:]
+    left, right = ids[:-1][same_doc], ids[1:][same_doc]
+    group = group_of_doc[docs[:-1][same_doc]]
+
+    # Sparse (group, left, right) counts plus both marginals, one sort each
+    keys, first, counts = np.unique(
+        (group * n_terms + left) * n_terms + right, return_index=True, return_counts=True
+    )
+    key_group = keys // (n_terms * n_terms)
+    key_left = (keys // n_terms) % n_terms
+    key_right = keys % n_terms
+
+    left_keys, left_counts = np.unique(group * n_terms + left, return_counts=True)
+    right_keys, right_counts = np.unique(group * n_terms + right, return_counts=True)
+    c_left = left_counts[np.searchsorted(left_keys, key_group * n_terms + key_left)].astype(float)
+    c_right = right_counts[np.searchsorted(right_keys, key_group * n_terms + key_right)].astype(float)
+    n = np.bincount(group, minlength=int(group_of_doc.max()) + 1 if len(group_of_doc) else 0)[key_group].astype(float)
+    c = counts.astype(float)
+
+    pmi = np.log2(c * n / (c_left * c_right))
+
+    # 2x2 contingency table of (left word, right word) for each bigram
+    observed = [c, c_left - c, c_right - c, n - c_left - c_right + c]
+    expected = [
+        c_left * c_right / n,
+        c_left * (n - c_right) / n,
+        (n - c_left) * c_right / n,
+        (n - c_left) * (n - c_right) / n
+    ]
+    llr = 2 * sum(_xlogx_ratio(k, e) for k, e in zip(observed, expected))
+
+    return {
+        "group": key_group,
+        "left": key_left,
+        "right": key_right,
+        "count": counts,
+        "first": first,
+        "pmi": pmi,
+        "llr": llr
+    }
+
+
+def _top_per_group(stats: Dict[str, np.ndarray], score: str, n_groups: int, top_n: int, min_count: int) -> List[np.ndarray]:
+    eligible = np.flatnonzero(stats["count"] >= min_count)
+    group = stats["group"][eligible]
+    # Highest score first; ties go to the earlier bigram in the corpus
+    order = eligible[np.lexsort((stats["first"][eligible], -stats[score][eligible], group))]
+    group_sorted = stats["group"][order]
+    starts = np.searchsorted(group_sorted, np.arange(n_groups))
+    ends = np.searchsorted(group_sorted, np.arange(n_groups), side="right")
+    return [order[s:min(e, s + top_n)] for s, e in zip(starts, ends)]
+
+
+def extract_collocations(
+    data: List[Dict[str, Any]],
+    by: str | None = "era",
+    top_n: int = 10,
+    min_count: int = 2,
+    corpus: LyricCorpus | None = None
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    if corpus is None:
+        corpus = LyricCorpus(data)
+
+    if by is None:
+        groups, group_of_doc = ["all"], np.zeros(corpus.n_docs, dtype=np.int64)
+    elif by == "era":
+        groups, group_of_doc = corpus.group_labels(corpus.eras)
+    elif by == "album":
+        groups, group_of_doc = corpus.group_labels(corpus.album_names)
+    else:
+        raise ValueError(f"Unknown grouping: {by!r}")
+
+    stats = bigram_statistics(corpus, group_of_doc)
+
+    def rows(indices: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "bigram": f"{corpus.vocabulary[stats['left'][i]]} {corpus.vocabulary[stats['right'][i]]}",
+                "count": int(stats["count"][i]),
+                "pmi": round(float(stats["pmi"][i]), 3),
+                "llr": round(float(stats["llr"][i]), 3)
+            }
+            for i in indices
+        ]
+
+    by_llr = _top_per_group(stats, "llr", len(groups), top_n, min_count)
+    by_pmi = _top_per_group(stats, "pmi", len(groups), top_n, min_count)
+    return {
+        g: {"llr": rows(llr), "pmi": rows(pmi)}
+        for g, llr, pmi in zip(groups, by_llr, by_pmi)
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("RADIOHEAD COLLOCATIONS")
+    print("=" * 70)
+
+    data = load_data()
+    corpus = LyricCorpus(data)
+
+    print("\n--- TOP BIGRAMS (LOG-LIKELIHOOD, ALL ALBUMS) ---")
+    for row in extract_collocations(data, by=None, top_n=15, corpus=corpus)["all"]["llr"]:
+        print(f"  {row['bigram']:<28} n={row['count']:<4} G2={row['llr']:<9} PMI={row['pmi']}")
+
+    print("\n--- SIGNATURE PHRASES BY ERA ---")
+    for era, ranked in extract_collocations(data, by="era", top_n=5, corpus=corpus).items():
+        print(f"\n  {era}: {', '.join(r['bigram'] for r in ranked['llr'])}")
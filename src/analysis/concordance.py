@@ -0,0 +1,338 @@
+"""
+Positional Inverted Index and KWIC Concordance for Radiohead Lyrics.
+
+Every word maps to postings of (track id, token offsets), so lookups never
+scan the lyrics:
+
+- Single-word, phrase and proximity ("rain" near "cold") queries
+- Keyword-in-context snippets cut from the original lyric text
+- Compact persistence: delta-encoded varint postings behind a JSON header,
+  written once at export time and decoded lazily per term on load. Lyrics
+  are not stored; they are re-attached from the corpus, whose fingerprint the
+  header records so a stale index is rebuilt instead of queried
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from analysis.caching import corpus_fingerprint
+from analysis.lexical_diversity import load_data
+
+
+INDEX_PATH = Path(__file__).resolve().parents[2] / "data" / "exports" / "lyrics_index.bin"
+
+INDEX_MAGIC = b"RHIX1"
+
+# Bumped whenever the header or posting layout changes
+INDEX_FORMAT_VERSION = 2
+
+TOKEN_PATTERN = re.compile(r"[a-zA-Z']+")
+
+# Postings: term -> {track id: sorted token offsets}
+Postings = Dict[int, List[int]]
+
+
+def token_spans(lyrics: str) -> List[Tuple[str, int, int]]:
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(lyrics)]
+
+
+def index_fingerprint(data: List[Dict[str, Any]]) -> str:
+    # Only the fields the index is built from
+    return corpus_fingerprint([
+        {"track": t["track_name"], "album": t["album_name"], "lyrics": t["lyrics"]} for t in data
+    ])
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_postings(postings: Postings) -> bytes:
+    # [n tracks] then per track: [track id delta][n offsets][offset deltas...]
+    out = bytearray()
+    encode_varint(len(postings), out)
+    previous_track = 0
+    for track in sorted(postings):
+        offsets = postings[track]
+        encode_varint(track - previous_track, out)
+        encode_varint(len(offsets), out)
+        previous_offset = 0
+        for offset in offsets:
+            encode_varint(offset - previous_offset, out)
+            previous_offset = offset
+        previous_track = track
+    return bytes(out)
+
+
+def decode_postings(buf: bytes, pos: int = 0) -> Postings:
+    postings: Postings = {}
+    n_tracks, pos = decode_varint(buf, pos)
+    track = 0
+    for _ in range(n_tracks):
+        delta, pos = decode_varint(buf, pos)
+        track += delta
+        n_offsets, pos = decode_varint(buf, pos)
+        offsets, offset = [], 0
+        for _ in range(n_offsets):
+            step, pos = decode_varint(buf, pos)
+            offset += step
+            offsets.append(offset)
+        postings[track] = offsets
+    return postings
+
+
+class LyricIndex:
+    def __init__(
+        self,
+        tracks: List[Dict[str, str]],
+        postings: Dict[str, Postings] | None = None,
+        blob: bytes = b"",
+        blob_offsets: Dict[str, Tuple[int, int]] | None = None,
+        fingerprint: str | None = None
+    ) -> None:
+        self.tracks = tracks
+        self.fingerprint = fingerprint
+        # Decoded postings; persisted terms are decoded on first use
+        self._postings: Dict[str, Postings] = postings or {}
+        self._blob = blob
+        self._blob_offsets = blob_offsets or {}
+        self._spans: Dict[int, List[Tuple[str, int, int]]] = {}
+
+    @classmethod
+    def build(cls, data: List[Dict[str, Any]]) -> "LyricIndex":
+        tracks, postings = [], {}
+        for track_id, track in enumerate(data):
+            tracks.append({
+                "track": track["track_name"],
+                "album": track["album_name"],
+                "lyrics": track["lyrics"]
+            })
+            for offset, (word, _, _) in enumerate(token_spans(track["lyrics"])):
+                postings.setdefault(word, {}).setdefault(track_id, []).append(offset)
+        return cls(tracks, postings, fingerprint=index_fingerprint(data))
+
+    @property
+    def vocabulary(self) -> List[str]:
+        return sorted(set(self._postings) | set(self._blob_offsets))
+
+    def postings(self, word: str) -> Postings:
+        word = word.lower()
+        if word not in self._postings:
+            span = self._blob_offsets.get(word)
+            if span is None:
+                return {}
+            self._postings[word] = decode_postings(self._blob[span[0]:span[1]])
+        return self._postings[word]
+
+    def document_frequency(self, word: str) -> int:
+        return len(self.postings(word))
+
+    # -------------------------------------------------------------------------
+    # Queries. Hits are (track id, first token offset, length in tokens).
+    # -------------------------------------------------------------------------
+
+    def word_hits(self, word: str) -> List[Tuple[int, int, int]]:
+        return [(t, p, 1) for t, offsets in sorted(self.postings(word).items()) for p in offsets]
+
+    def phrase_hits(self, phrase: str) -> List[Tuple[int, int, int]]:
+        words = [w for w, _, _ in token_spans(phrase)]
+        if not words:
+            return []
+        lists = [self.postings(w) for w in words]
+        # Start from the rarest word's tracks
+        tracks = set(min(lists, key=len))
+        for postings in lists:
+            tracks &= postings.keys()
+
+        hits = []
+        for track in sorted(tracks):
+            starts = set(lists[0][track])
+            for i, postings in enumerate(lists[1:], start=1):
+                starts &= {p - i for p in postings[track]}
+                if not starts:
+                    break
+            hits.extend((track, p, len(words)) for p in sorted(starts))
+        return hits
+
+    def near_hits(self, word_a: str, word_b: str, window: int = 10) -> List[Tuple[int, int, int]]:
+        a, b = self.postings(word_a), self.postings(word_b)
+        hits, seen = [], set()
+        for track in sorted(a.keys() & b.keys()):
+            others = b[track]
+            for p in a[track]:
+                # Nearest occurrence of word_b to p, other than p itself when
+                # both words are the same; ties go to the earlier one
+                i = bisect_left(others, p)
+                after = i + 1 if i < len(others) and others[i] == p else i
+                candidates = [others[j] for j in (i - 1, after) if 0 <= j < len(others)]
+                if not candidates:
+                    continue
+                q = min(candidates, key=lambda c: (abs(c - p), c))
+                hit = (track, min(p, q), abs(p - q) + 1)
+                # A repeated word pairs each neighbouring occurrence twice
+                if abs(p - q) <= window and hit not in seen:
+                    seen.add(hit)
+                    hits.append(hit)
+        return hits
+
+    def _hit_tracks(self, hits: List[Tuple[int, int, int]]) -> List[Dict[str, Any]]:
+        counts: Dict[int, int] = {}
+        for track, _, _ in hits:
+            counts[track] = counts.get(track, 0) + 1
+        return [
+            {"track": self.tracks[t]["track"], "album": self.tracks[t]["album"], "hits": n}
+            for t, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        ]
+
+    def search(self, word: str) -> List[Dict[str, Any]]:
+        return self._hit_tracks(self.word_hits(word))
+
+    def phrase(self, phrase: str) -> List[Dict[str, Any]]:
+        return self._hit_tracks(self.phrase_hits(phrase))
+
+    def near(self, word_a: str, word_b: str, window: int = 10) -> List[Dict[str, Any]]:
+        return self._hit_tracks(self.near_hits(word_a, word_b, window))
+
+    def kwic(self, hits: List[Tuple[int, int, int]], context: int = 5, limit: int | None = 20) -> List[Dict[str, Any]]:
+        lines = []
+        for track, start, length in hits[:limit]:
+            lyrics = self.tracks[track]["lyrics"]
+            if track not in self._spans:
+                self._spans[track] = token_spans(lyrics)
+            spans = self._spans[track]
+            end = start + length - 1
+            left = spans[max(start - context, 0)][1]
+            right = spans[min(end + context, len(spans) - 1)][2]
+            lines.append({
+                "track": self.tracks[track]["track"],
+                "album": self.tracks[track]["album"],
+                "left": " ".join(lyrics[left:spans[start][1]].split()),
+                "match": " ".join(lyrics[spans[start][1]:spans[end][2]].split()),
+                "right": " ".join(lyrics[spans[end][2]:right].split())
+            })
+        return lines
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Path = INDEX_PATH) -> Path:
+        blob = bytearray()
+        terms = self.vocabulary
+        sizes = []
+        for word in terms:
+            encoded = encode_postings(self.postings(word))
+            sizes.append(len(encoded))
+            blob.extend(encoded)
+
+        # Terms are stored in blob order, so sizes alone locate each posting list
+        header = json.dumps(
+            {
+                "version": INDEX_FORMAT_VERSION,
+                "corpus": self.fingerprint,
+                "tracks": [{"track": t["track"], "album": t["album"]} for t in self.tracks],
+                "terms": terms,
+                "sizes": sizes
+            },
+            ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a partial index
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(INDEX_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                f.write(blob)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH, data: List[Dict[str, Any]] | None = None) -> "LyricIndex":
+        # Raises ValueError unless the index was built from exactly this corpus
+        if data is None:
+            data = load_data()
+        with open(path, "rb") as f:
+            raw = f.read()
+        if not raw.startswith(INDEX_MAGIC):
+            raise ValueError(f"Not a lyric index: {path}")
+        start = len(INDEX_MAGIC)
+        (header_len,) = struct.unpack_from("<I", raw, start)
+        start += 4
+        header = json.loads(raw[start:start + header_len].decode("utf-8"))
+        if header.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported lyric index version: {header.get('version')!r}")
+        fingerprint = index_fingerprint(data)
+        if header.get("corpus") != fingerprint:
+            raise ValueError(f"Lyric index is stale for this corpus: {path}")
+        blob = raw[start + header_len:]
+        tracks = [{**entry, "lyrics": track["lyrics"]} for entry, track in zip(header["tracks"], data)]
+
+        blob_offsets, end = {}, 0
+        for word, size in zip(header["terms"], header["sizes"]):
+            blob_offsets[word] = (end, end + size)
+            end += size
+        return cls(tracks, blob=blob, blob_offsets=blob_offsets, fingerprint=fingerprint)
+
+
+def load_index(path: Path = INDEX_PATH, data: List[Dict[str, Any]] | None = None) -> LyricIndex:
+    # Persisted index when it matches the corpus, otherwise built in memory
+    if data is None:
+        data = load_data()
+    try:
+        return LyricIndex.load(path, data)
+    except (FileNotFoundError, KeyError, ValueError, struct.error):
+        return LyricIndex.build(data)
+
+
+def export_index(data: List[Dict[str, Any]] | None = None, path: Path = INDEX_PATH) -> Path:
+    return LyricIndex.build(data if data is not None else load_data()).save(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print("=" * 70)
+    print("RADIOHEAD LYRIC CONCORDANCE")
+    print("=" * 70)
+
+    index = load_index()
+    words = sys.argv[1:] or ["rain", "cold"]
+
+    if len(words) == 2 and "--phrase" not in sys.argv:
+        hits = index.near_hits(words[0], words[1], window=10)
+        print(f"\n--- '{words[0]}' within 10 words of '{words[1]}' ---")
+    else:
+        query = " ".join(w for w in words if w != "--phrase")
+        hits = index.phrase_hits(query)
+        print(f"\n--- '{query}' ---")
+
+    for line in index.kwic(hits):
+        print(f"  {line['left'][-35:]:>35} [{line['match']}] {line['right'][:35]:<35}  {line['track']}")
@@ -22,11 +22,24 @@ H4: In Rainbows is the outlier, not Kid A.
 
 from __future__ import annotations
 
+import copy
 import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, List, Any, Tuple
 from collections import defaultdict
+from functools import lru_cache
 
+import numpy as np
+
+from analysis.caching import corpus_fingerprint, file_fingerprint
+from analysis.outliers import compare_albums, score_album_outliers
+from analysis.refrains import refrain_coverage
+from analysis.rhymes import rhyme_density
 from analysis.topic_modeling import test_h3_thematic_continuity
 
 try:
@@ -34,10 +47,17 @@ try:
 except ImportError:
     stats = None  # type: ignore
 
+# Below this size (in either group, with no ties) the exact U distribution is
+# used, as scipy does, provided the n1*n2 table stays small
+EXACT_MWU_MAX_N = 8
+EXACT_MWU_MAX_CELLS = 20_000
+
+EXPORT_PATH = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+
 
 def load_data(path: Path | None = None) -> List[Dict[str, Any]]:
     if path is None:
-        path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+        path = EXPORT_PATH
 
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -67,20 +87,84 @@ def album_means(data: List[Dict[str, Any]], metric: str) -> Dict[str, float]:
     return means
 
 
-def mann_whitney_test(group1: List[float], group2: List[float]) -> Dict[str, Any]:
-    if stats is None:
-        return {"error": "scipy not available", "u_statistic": None, "p_value": None}
+def rank_average(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Sort once; tied values share the mean of the ranks they span
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    avg_ranks = ends - (counts - 1) / 2.0
+    return avg_ranks[inverse], counts
+
+
+def _mwu_exact_counts(n1: int, n2: int) -> np.ndarray:
+    # Number of orderings yielding each U = 0..n1*n2, using the recurrence
+    # f(i, j, u) = f(i - 1, j, u - j) + f(i, j - 1, u), iterated over j so only
+    # one (n1 + 1) x (n1*n2 + 1) table is ever held and nothing recurses.
+    # U has the same distribution with the samples swapped, so the smaller
+    # sample indexes the rows.
+    n1, n2 = min(n1, n2), max(n1, n2)
+    counts = np.zeros((n1 + 1, n1 * n2 + 1))
+    counts[:, 0] = 1.0
+    for j in range(1, n2 + 1):
+        for i in range(1, n1 + 1):
+            counts[i, j:] += counts[i - 1, :len(counts[i]) - j]
+    return counts[n1]
+
+
+@lru_cache(maxsize=256)
+def mwu_exact_sf_table(n1: int, n2: int) -> np.ndarray:
+    counts = _mwu_exact_counts(n1, n2)
+    pmf = counts / counts.sum()
+    # sf[u] = P(U >= u)
+    return np.cumsum(pmf[::-1])[::-1]
+
+
+def mwu_p_value(u1: float, n1: int, n2: int, tie_term: float) -> float:
+    # Two-sided p-value for U1; tie_term = sum(t^3 - t) over tied value blocks
+    u = max(u1, n1 * n2 - u1)
+
+    small = min(n1, n2) <= EXACT_MWU_MAX_N and n1 * n2 <= EXACT_MWU_MAX_CELLS
+    if small and tie_term == 0:
+        p = 2 * float(mwu_exact_sf_table(n1, n2)[int(u)])
+    else:
+        # Normal approximation with tie and continuity correction
+        n = n1 + n2
+        sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+        if sigma == 0:
+            p = 1.0
+        else:
+            z = (u - n1 * n2 / 2 - 0.5) / sigma
+            p = 2 * 0.5 * math.erfc(z / math.sqrt(2))
+
+    return min(max(p, 0.0), 1.0)
+
+
+def mann_whitney_numpy(group1: List[float], group2: List[float]) -> Tuple[float, float]:
+    x = np.asarray(group1, dtype=float)
+    y = np.asarray(group2, dtype=float)
+    n1, n2 = len(x), len(y)
+
+    ranks, ties = rank_average(np.concatenate([x, y]))
+    u1 = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2)
+    tie_term = float((ties.astype(float) ** 3 - ties).sum())
+
+    return u1, mwu_p_value(u1, n1, n2, tie_term)
+
 
+def mann_whitney_test(group1: List[float], group2: List[float]) -> Dict[str, Any]:
     if len(group1) < 3 or len(group2) < 3:
         return {"error": "Too few samples", "u_statistic": None, "p_value": None}
 
-    result = stats.mannwhitneyu(group1, group2, alternative='two-sided')
+    if stats is not None:
+        result = stats.mannwhitneyu(group1, group2, alternative='two-sided')
+        u_statistic, p_value = result.statistic, result.pvalue
+    else:
+        u_statistic, p_value = mann_whitney_numpy(group1, group2)
 
     return {
-        "u_statistic": round(result.statistic, 4),
-        "p_value": round(result.pvalue, 6),
-        "significant_05": result.pvalue < 0.05,
-        "significant_01": result.pvalue < 0.01,
+        "u_statistic": round(u_statistic, 4),
+        "p_value": round(p_value, 6),
+        "significant_05": p_value < 0.05,
+        "significant_01": p_value < 0.01,
         "group1_median": round(sorted(group1)[len(group1)//2], 4),
         "group2_median": round(sorted(group2)[len(group2)//2], 4),
         "group1_mean": round(sum(group1)/len(group1), 4),
@@ -107,23 +191,323 @@ def effect_size_cohens_d(group1: List[float], group2: List[float]) -> float:
 
 
 # =============================================================================
-# H1: THE COLDNESS TEST
+# DECLARATIVE HYPOTHESIS SPECS
 # =============================================================================
 
-def test_h1_coldness(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    by_album = group_by_album(data)
+# Group selectors:
+#   {"albums": [...]}          tracks on any listed album
+#   {"exclude_albums": [...]}  tracks on any other album
+#   {"eras": [...]}            tracks from any listed era
+#   {"years": [start, end]}    album_year within the inclusive range
+# Specs sharing a "family" are corrected together for multiple comparisons.
+HYPOTHESIS_SPECS: List[Dict[str, Any]] = [
+    {
+        "id": "h1_coldness",
+        "metric": "coldness_index",
+        "group1": {"albums": ["The Bends", "OK Computer"]},
+        "group2": {"albums": ["Kid A"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h1"
+    },
+    {
+        "id": "h1_sentiment",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["The Bends", "OK Computer"]},
+        "group2": {"albums": ["Kid A", "Amnesiac"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h1"
+    },
+    {
+        "id": "h2_type_token_ratio",
+        "metric": "type_token_ratio",
+        "group1": {"albums": ["Pablo Honey", "The Bends", "OK Computer"]},
+        "group2": {"albums": ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h2"
+    },
+    {
+        "id": "h2_sentence_length",
+        "metric": "avg_sentence_length",
+        "group1": {"albums": ["Pablo Honey", "The Bends", "OK Computer"]},
+        "group2": {"albums": ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h2"
+    },
+    {
+        "id": "h2_refrain_coverage",
+        "metric": "refrain_coverage",
+        "group1": {"albums": ["Pablo Honey", "The Bends", "OK Computer"]},
+        "group2": {"albums": ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h2"
+    },
+    {
+        "id": "h2_rhyme_density",
+        "metric": "rhyme_density",
+        "group1": {"albums": ["Pablo Honey", "The Bends", "OK Computer"]},
+        "group2": {"albums": ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h2"
+    },
+    {
+        "id": "h2_sentiment",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["Pablo Honey", "The Bends", "OK Computer"]},
+        "group2": {"albums": ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "h2"
+    },
+    {
+        "id": "h4_in_rainbows_vs_hail_to_thief",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["Hail to the Thief"]},
+        "group2": {"albums": ["In Rainbows"]},
+        "test": "mann_whitney",
+        "correction": "holm",
+        "family": "h4"
+    },
+    {
+        "id": "h4_in_rainbows_vs_king_of_limbs",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["In Rainbows"]},
+        "group2": {"albums": ["The King of Limbs"]},
+        "test": "mann_whitney",
+        "correction": "holm",
+        "family": "h4"
+    },
+    {
+        "id": "h4_kid_a_vs_ok_computer",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["OK Computer"]},
+        "group2": {"albums": ["Kid A"]},
+        "test": "mann_whitney",
+        "correction": "holm",
+        "family": "h4"
+    },
+    {
+        "id": "h4_kid_a_vs_amnesiac",
+        "metric": "sentiment_score",
+        "group1": {"albums": ["Kid A"]},
+        "group2": {"albums": ["Amnesiac"]},
+        "test": "mann_whitney",
+        "correction": "holm",
+        "family": "h4"
+    },
+    {
+        "id": "amsp_sadness",
+        "metric": "emotion_sadness",
+        "group1": {"exclude_albums": ["A Moon Shaped Pool"]},
+        "group2": {"albums": ["A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "amsp"
+    },
+    {
+        "id": "amsp_sentiment",
+        "metric": "sentiment_score",
+        "group1": {"exclude_albums": ["A Moon Shaped Pool"]},
+        "group2": {"albums": ["A Moon Shaped Pool"]},
+        "test": "mann_whitney",
+        "correction": None,
+        "family": "amsp"
+    },
+]
+
+EMPTY_GROUP_RESULT: Dict[str, Any] = {"error": "Empty group", "u_statistic": None, "p_value": None}
+
+SPECS_BY_ID: Dict[str, Dict[str, Any]] = {spec["id"]: spec for spec in HYPOTHESIS_SPECS}
+
+STAT_TESTS: Dict[str, Callable[[List[float], List[float]], Dict[str, Any]]] = {
+    "mann_whitney": mann_whitney_test
+}
+
+
+def build_columns(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Grouping columns are materialized once; metric columns and group masks
+    # are filled lazily and shared by every spec evaluated against them.
+    return {
+        "n": len(data),
+        "album": np.array([t["album_name"] for t in data], dtype=object),
+        "era": np.array([t["era"] for t in data], dtype=object),
+        "year": np.array([t["album_year"] for t in data], dtype=int),
+        "tracks": data,
+        "metrics": {},
+        "masks": {}
+    }
+
+
+# Metrics computed from the lyrics when a track does not carry them
+DERIVED_METRICS: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "refrain_coverage": refrain_coverage,
+    "rhyme_density": rhyme_density
+}
+
+
+def track_metric(track: Dict[str, Any], metric: str) -> float | None:
+    if metric in track:
+        return track[metric]
+    if metric in DERIVED_METRICS:
+        return DERIVED_METRICS[metric](track)
+    return None
 
-    # Pre-2000 rock era (The Bends, OK Computer)
-    pre_2000 = []
-    for album in ["The Bends", "OK Computer"]:
-        if album in by_album:
-            pre_2000.extend([t["coldness_index"] for t in by_album[album]])
 
-    # Kid A
-    kid_a = [t["coldness_index"] for t in by_album.get("Kid A", [])]
+def metric_column(columns: Dict[str, Any], metric: str) -> np.ndarray:
+    if metric not in columns["metrics"]:
+        tracks = columns["tracks"]
+        # A TrackTable already holds stored metrics as a float column
+        if metric in getattr(tracks, "numeric_index", ()) and metric not in DERIVED_METRICS:
+            columns["metrics"][metric] = tracks.column(metric).copy()
+            return columns["metrics"][metric]
+        values = [track_metric(t, metric) for t in tracks]
+        columns["metrics"][metric] = np.array(
+            [np.nan if v is None else v for v in values], dtype=float
+        )
+    return columns["metrics"][metric]
+
+
+def group_mask(columns: Dict[str, Any], selector: Dict[str, Any]) -> np.ndarray:
+    key = json.dumps(selector, sort_keys=True)
+    if key in columns["masks"]:
+        return columns["masks"][key]
+
+    mask = np.ones(columns["n"], dtype=bool)
+    if "albums" in selector:
+        mask &= np.isin(columns["album"], selector["albums"])
+    if "exclude_albums" in selector:
+        mask &= ~np.isin(columns["album"], selector["exclude_albums"])
+    if "eras" in selector:
+        mask &= np.isin(columns["era"], selector["eras"])
+    if "years" in selector:
+        start, end = selector["years"]
+        mask &= (columns["year"] >= start) & (columns["year"] <= end)
+
+    columns["masks"][key] = mask
+    return mask
+
+
+def track_in_group(track: Dict[str, Any], selector: Dict[str, Any]) -> bool:
+    # Single-track counterpart of group_mask, for incremental updates
+    if "albums" in selector and track["album_name"] not in selector["albums"]:
+        return False
+    if "exclude_albums" in selector and track["album_name"] in selector["exclude_albums"]:
+        return False
+    if "eras" in selector and track["era"] not in selector["eras"]:
+        return False
+    if "years" in selector:
+        start, end = selector["years"]
+        if not start <= track["album_year"] <= end:
+            return False
+    return True
+
+
+def adjust_p_values(p_values: List[float], method: str | None) -> List[float]:
+    p = np.asarray(p_values, dtype=float)
+    m = len(p)
+    if method is None or m == 0:
+        return p.tolist()
+
+    order = np.argsort(p)
+    ranked = p[order]
+    if method == "bonferroni":
+        adjusted = np.minimum(p * m, 1.0)
+        return adjusted.tolist()
+    if method == "holm":
+        stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == "fdr_bh":
+        stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction: {method!r}")
+
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(stepped, 1.0)
+    return adjusted.tolist()
+
+
+def run_specs(
+    data_or_columns: List[Dict[str, Any]] | Dict[str, Any],
+    spec_ids: List[str] | None = None,
+    specs: List[Dict[str, Any]] | None = None
+) -> Dict[str, Dict[str, Any]]:
+    columns = (
+        data_or_columns if isinstance(data_or_columns, dict) else build_columns(data_or_columns)
+    )
+    if specs is None:
+        specs = HYPOTHESIS_SPECS if spec_ids is None else [SPECS_BY_ID[i] for i in spec_ids]
+
+    results = {}
+    for spec in specs:
+        values = metric_column(columns, spec["metric"])
+        group1 = values[group_mask(columns, spec["group1"]) & ~np.isnan(values)].tolist()
+        group2 = values[group_mask(columns, spec["group2"]) & ~np.isnan(values)].tolist()
+
+        if not group1 or not group2:
+            results[spec["id"]] = {"spec": spec, "results": None, "effect_size_cohens_d": None}
+            continue
+
+        results[spec["id"]] = {
+            "spec": spec,
+            "results": STAT_TESTS[spec["test"]](group1, group2),
+            "effect_size_cohens_d": effect_size_cohens_d(group1, group2)
+        }
+
+    apply_corrections(specs, results)
+    return results
+
+
+def apply_corrections(specs: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> None:
+    # Multiple-comparison correction within each family of evaluated specs
+    families = defaultdict(list)
+    for spec in specs:
+        result = results[spec["id"]]["results"]
+        if spec.get("correction") and result and result.get("p_value") is not None:
+            families[(spec.get("family", spec["id"]), spec["correction"])].append(spec["id"])
+
+    for (_, method), ids in families.items():
+        adjusted = adjust_p_values([results[i]["results"]["p_value"] for i in ids], method)
+        for spec_id, p_adj in zip(ids, adjusted):
+            test_result = results[spec_id]["results"]
+            test_result["correction"] = method
+            test_result["p_adjusted"] = round(p_adj, 6)
+            test_result["significant_adjusted_05"] = p_adj < 0.05
+
+
+def run_hypothesis_specs(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    results = run_specs(data if columns is None else columns)
+    return {
+        "n_specs": len(results),
+        "results": {
+            spec_id: {
+                "metric": r["spec"]["metric"],
+                "group1": r["spec"]["group1"],
+                "group2": r["spec"]["group2"],
+                "test": r["spec"]["test"],
+                "results": r["results"],
+                "effect_size_cohens_d": r["effect_size_cohens_d"]
+            }
+            for spec_id, r in results.items()
+        }
+    }
+
+
+# =============================================================================
+# H1: THE COLDNESS TEST
+# =============================================================================
 
-    test_result = mann_whitney_test(pre_2000, kid_a)
-    effect_size = effect_size_cohens_d(pre_2000, kid_a)
+def test_h1_coldness(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    spec = run_specs(data if columns is None else columns, ["h1_coldness"])["h1_coldness"]
+    test_result = spec["results"] or dict(EMPTY_GROUP_RESULT)
+    effect_size = spec["effect_size_cohens_d"] or 0.0
 
     # Album-level coldness means
     coldness_means = album_means(data, "coldness_index")
@@ -154,21 +538,12 @@ def test_h1_coldness(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def test_h1_sentiment(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    by_album = group_by_album(data)
-
-    rock_era = []
-    for album in ["The Bends", "OK Computer"]:
-        if album in by_album:
-            rock_era.extend([t["sentiment_score"] for t in by_album[album]])
-
-    reinvention_era = []
-    for album in ["Kid A", "Amnesiac"]:
-        if album in by_album:
-            reinvention_era.extend([t["sentiment_score"] for t in by_album[album]])
-
-    test_result = mann_whitney_test(rock_era, reinvention_era)
-    effect_size = effect_size_cohens_d(rock_era, reinvention_era)
+def test_h1_sentiment(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    spec = run_specs(data if columns is None else columns, ["h1_sentiment"])["h1_sentiment"]
+    test_result = spec["results"] or dict(EMPTY_GROUP_RESULT)
+    effect_size = spec["effect_size_cohens_d"] or 0.0
 
     return {
         "hypothesis": "H1 (sentiment): Kid A era not more negative",
@@ -188,47 +563,40 @@ def test_h1_sentiment(data: List[Dict[str, Any]]) -> Dict[str, Any]:
 # H2: VOCABULARY FRAGMENTATION
 # =============================================================================
 
-def test_h2_fragmentation(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    by_album = group_by_album(data)
-
+def test_h2_fragmentation(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
     # Calculate album-level metrics
     ttr_by_album = album_means(data, "type_token_ratio")
     sentiment_by_album = album_means(data, "sentiment_score")
     sentence_len_by_album = album_means(data, "avg_sentence_length")
 
     # Early (pre-2000) vs Late (post-2007)
-    early_albums = ["Pablo Honey", "The Bends", "OK Computer"]
-    late_albums = ["In Rainbows", "The King of Limbs", "A Moon Shaped Pool"]
-
-    early_ttr = []
-    late_ttr = []
-    early_sent = []
-    late_sent = []
-
-    for album, tracks in by_album.items():
-        if album in early_albums:
-            early_ttr.extend([t["type_token_ratio"] for t in tracks])
-            early_sent.extend([t["sentiment_score"] for t in tracks])
-        elif album in late_albums:
-            late_ttr.extend([t["type_token_ratio"] for t in tracks])
-            late_sent.extend([t["sentiment_score"] for t in tracks])
-
-    early_sentence_len = []
-    late_sentence_len = []
-
-    for album, tracks in by_album.items():
-        if album in early_albums:
-            early_sentence_len.extend([t["avg_sentence_length"] for t in tracks])
-        elif album in late_albums:
-            late_sentence_len.extend([t["avg_sentence_length"] for t in tracks])
-
-    ttr_test = mann_whitney_test(early_ttr, late_ttr)
-    sentence_test = mann_whitney_test(early_sentence_len, late_sentence_len)
-    sent_test = mann_whitney_test(early_sent, late_sent)
-
-    ttr_effect = effect_size_cohens_d(early_ttr, late_ttr)
-    sentence_effect = effect_size_cohens_d(early_sentence_len, late_sentence_len)
-    sent_effect = effect_size_cohens_d(early_sent, late_sent)
+    if columns is None:
+        columns = build_columns(data)
+    specs = run_specs(columns, [
+        "h2_type_token_ratio", "h2_sentence_length", "h2_refrain_coverage",
+        "h2_rhyme_density", "h2_sentiment"
+    ])
+
+    ttr_test = specs["h2_type_token_ratio"]["results"] or dict(EMPTY_GROUP_RESULT)
+    sentence_test = specs["h2_sentence_length"]["results"] or dict(EMPTY_GROUP_RESULT)
+    refrain_test = specs["h2_refrain_coverage"]["results"] or dict(EMPTY_GROUP_RESULT)
+    rhyme_test = specs["h2_rhyme_density"]["results"] or dict(EMPTY_GROUP_RESULT)
+    sent_test = specs["h2_sentiment"]["results"] or dict(EMPTY_GROUP_RESULT)
+
+    ttr_effect = specs["h2_type_token_ratio"]["effect_size_cohens_d"] or 0.0
+    sentence_effect = specs["h2_sentence_length"]["effect_size_cohens_d"] or 0.0
+    refrain_effect = specs["h2_refrain_coverage"]["effect_size_cohens_d"] or 0.0
+    rhyme_effect = specs["h2_rhyme_density"]["effect_size_cohens_d"] or 0.0
+    sent_effect = specs["h2_sentiment"]["effect_size_cohens_d"] or 0.0
+
+    # Structural metrics per album from the columns the spec engine already filled
+    albums = list(dict.fromkeys(columns["album"]))
+    coverage = metric_column(columns, "refrain_coverage")
+    refrain_by_album = {a: float(coverage[columns["album"] == a].mean()) for a in albums}
+    density = metric_column(columns, "rhyme_density")
+    rhyme_by_album = {a: float(density[columns["album"] == a].mean()) for a in albums}
 
     lexical_shift = max(abs(ttr_effect), abs(sentence_effect))
 
@@ -237,7 +605,7 @@ def test_h2_fragmentation(data: List[Dict[str, Any]]) -> Dict[str, Any]:
         "description": (
             "Testing whether lexical diversity (type-token ratio) changed "
             "more than sentiment between early and late eras, with sentence "
-            "length as a proxy for fragmentation."
+            "length, refrain coverage and rhyme density as proxies for fragmentation."
         ),
         "comparison": "Early (PH/Bends/OKC) vs Late (IR/TKOL/AMSP)",
         "lexical_diversity": {
@@ -250,6 +618,16 @@ def test_h2_fragmentation(data: List[Dict[str, Any]]) -> Dict[str, Any]:
             "effect_size": sentence_effect,
             "by_album": sentence_len_by_album
         },
+        "refrain_coverage": {
+            "test": refrain_test,
+            "effect_size": refrain_effect,
+            "by_album": refrain_by_album
+        },
+        "rhyme_density": {
+            "test": rhyme_test,
+            "effect_size": rhyme_effect,
+            "by_album": rhyme_by_album
+        },
         "sentiment": {
             "test": sent_test,
             "effect_size": sent_effect,
@@ -267,31 +645,29 @@ def test_h2_fragmentation(data: List[Dict[str, Any]]) -> Dict[str, Any]:
 # H4: IN RAINBOWS AS OUTLIER
 # =============================================================================
 
-def test_h4_in_rainbows(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    by_album = group_by_album(data)
+def test_h4_in_rainbows(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    # In Rainbows and Kid A against their neighbors, Holm-corrected together
+    specs = run_specs(data if columns is None else columns, [
+        "h4_in_rainbows_vs_hail_to_thief", "h4_in_rainbows_vs_king_of_limbs",
+        "h4_kid_a_vs_ok_computer", "h4_kid_a_vs_amnesiac"
+    ])
 
-    # Compare In Rainbows to its neighbors
-    hail_to_thief = [t["sentiment_score"] for t in by_album.get("Hail to the Thief", [])]
-    in_rainbows = [t["sentiment_score"] for t in by_album.get("In Rainbows", [])]
-    king_limbs = [t["sentiment_score"] for t in by_album.get("The King of Limbs", [])]
-
-    # Also compare Kid A to its neighbors
-    ok_computer = [t["sentiment_score"] for t in by_album.get("OK Computer", [])]
-    kid_a = [t["sentiment_score"] for t in by_album.get("Kid A", [])]
-    amnesiac = [t["sentiment_score"] for t in by_album.get("Amnesiac", [])]
-
-    # Test In Rainbows shifts
-    ir_vs_httf = mann_whitney_test(hail_to_thief, in_rainbows) if hail_to_thief and in_rainbows else None
-    ir_vs_tkol = mann_whitney_test(in_rainbows, king_limbs) if in_rainbows and king_limbs else None
-
-    # Test Kid A shifts
-    ka_vs_okc = mann_whitney_test(ok_computer, kid_a) if ok_computer and kid_a else None
-    ka_vs_amn = mann_whitney_test(kid_a, amnesiac) if kid_a and amnesiac else None
+    ir_vs_httf = specs["h4_in_rainbows_vs_hail_to_thief"]["results"]
+    ir_vs_tkol = specs["h4_in_rainbows_vs_king_of_limbs"]["results"]
+    ka_vs_okc = specs["h4_kid_a_vs_ok_computer"]["results"]
+    ka_vs_amn = specs["h4_kid_a_vs_amnesiac"]["results"]
 
     # Calculate warmth for each album
     warmth_by_album = album_means(data, "warmth")
     joy_by_album = album_means(data, "emotion_joy")
 
+    # Every numeric feature at once, every album ranked
+    outliers = score_album_outliers(data)
+    ir_vs_ka = compare_albums(outliers, "In Rainbows", "Kid A")
+    multivariate_outlier = ir_vs_ka.get("more_outlying_mahalanobis")
+
     return {
         "hypothesis": "H4: In Rainbows is the outlier, not Kid A",
         "description": (
@@ -308,22 +684,43 @@ def test_h4_in_rainbows(data: List[Dict[str, Any]]) -> Dict[str, Any]:
         },
         "warmth_by_album": warmth_by_album,
         "joy_by_album": joy_by_album,
-        "interpretation": (
-            "In Rainbows shows distinct warmth and joy scores, potentially "
+        "multivariate_outliers": outliers,
+        "in_rainbows_vs_kid_a": ir_vs_ka,
+        "interpretation": h4_interpretation(outliers, multivariate_outlier)
+    }
+
+
+def h4_interpretation(outliers: Dict[str, Any], multivariate_outlier: str | None) -> str:
+    if multivariate_outlier is None:
+        return "In Rainbows and Kid A could not both be scored, so H4 is untested."
+
+    overall = outliers["most_outlying_album"]
+    features = f"Across {len(outliers['features'])} lyric-content features"
+    if multivariate_outlier == "In Rainbows":
+        verdict = (
+            f"{features}, In Rainbows is a stronger multivariate outlier than Kid A, "
             "supporting H4 as a return to directness after the Kid A era."
         )
-    }
+    else:
+        verdict = (
+            f"{features}, Kid A is a stronger multivariate outlier than In Rainbows, "
+            "so H4 is not supported."
+        )
+    if overall not in ("In Rainbows", "Kid A"):
+        verdict += f" The most outlying album overall is {overall}."
+    return verdict
 
 
 # =============================================================================
 # MOON SHAPED POOL ANALYSIS
 # =============================================================================
 
-def analyze_moon_shaped_pool(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_moon_shaped_pool(
+    data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
     by_album = group_by_album(data)
 
     amsp = by_album.get("A Moon Shaped Pool", [])
-    other_albums = [t for t in data if t["album_name"] != "A Moon Shaped Pool"]
 
     if not amsp:
         return {"error": "A Moon Shaped Pool not found in data"}
@@ -331,11 +728,10 @@ def analyze_moon_shaped_pool(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     # Get AMSP metrics
     amsp_sadness = [t["emotion_sadness"] for t in amsp]
     amsp_sentiment = [t["sentiment_score"] for t in amsp]
-    other_sadness = [t["emotion_sadness"] for t in other_albums]
-    other_sentiment = [t["sentiment_score"] for t in other_albums]
 
-    sadness_test = mann_whitney_test(other_sadness, amsp_sadness)
-    sentiment_test = mann_whitney_test(other_sentiment, amsp_sentiment)
+    specs = run_specs(data if columns is None else columns, ["amsp_sadness", "amsp_sentiment"])
+    sadness_test = specs["amsp_sadness"]["results"]
+    sentiment_test = specs["amsp_sentiment"]["results"]
 
     # Track-level for AMSP
     track_metrics = []
@@ -373,22 +769,136 @@ def analyze_moon_shaped_pool(data: List[Dict[str, Any]]) -> Dict[str, Any]:
 # FULL HYPOTHESIS REPORT
 # =============================================================================
 
-def generate_full_report() -> Dict[str, Any]:
-    data = load_data()
-
-    return {
+# Each job is independent, so the expensive H3 topic model never gates the
+# cheap lexical tests. Longest-running jobs are listed first so they are
+# submitted to the pool first.
+HYPOTHESIS_JOBS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "h3_thematic_continuity_test": test_h3_thematic_continuity,
+    "h1_coldness_test": test_h1_coldness,
+    "h1_sentiment_test": test_h1_sentiment,
+    "h2_fragmentation_test": test_h2_fragmentation,
+    "h4_in_rainbows_test": test_h4_in_rainbows,
+    "moon_shaped_pool_analysis": analyze_moon_shaped_pool,
+    "hypothesis_specs": run_hypothesis_specs,
+}
+
+# Jobs that evaluate specs and accept prebuilt columns; the rest take data only
+COLUMN_JOBS = {
+    "h1_coldness_test", "h1_sentiment_test", "h2_fragmentation_test",
+    "h4_in_rainbows_test", "moon_shaped_pool_analysis", "hypothesis_specs"
+}
+
+# (job name, corpus fingerprint) -> result, reused across report runs
+_REPORT_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+def report_columns(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Every spec metric is materialized up front, so refrain and rhyme
+    # extraction runs once per report instead of once per job or worker
+    columns = build_columns(data)
+    for spec in HYPOTHESIS_SPECS:
+        metric_column(columns, spec["metric"])
+    return columns
+
+
+def _run_timed_job(
+    name: str, data: List[Dict[str, Any]], columns: Dict[str, Any] | None = None
+) -> Tuple[str, Dict[str, Any], float]:
+    start = time.perf_counter()
+    if name in COLUMN_JOBS and columns is not None:
+        result = HYPOTHESIS_JOBS[name](data, columns)
+    else:
+        result = HYPOTHESIS_JOBS[name](data)
+    return name, result, time.perf_counter() - start
+
+
+def run_hypothesis_jobs(
+    data: List[Dict[str, Any]],
+    jobs: List[str] | None = None,
+    max_workers: int | None = None,
+    use_cache: bool = True,
+    fingerprint: str | None = None
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    if jobs is None:
+        jobs = list(HYPOTHESIS_JOBS)
+
+    # Hashing the corpus is the fallback for data not loaded from the export
+    if fingerprint is None:
+        fingerprint = corpus_fingerprint(data)
+    results: Dict[str, Dict[str, Any]] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+
+    pending = []
+    for name in jobs:
+        if use_cache and (name, fingerprint) in _REPORT_CACHE:
+            # Copies both ways, so mutating a report never reaches the cache
+            results[name] = copy.deepcopy(_REPORT_CACHE[(name, fingerprint)])
+            timings[name] = {"seconds": 0.0, "cache_hit": True}
+        else:
+            pending.append(name)
+
+    if max_workers is None:
+        max_workers = min(len(pending), os.cpu_count() or 1)
+
+    columns = report_columns(data) if COLUMN_JOBS.intersection(pending) else None
+
+    completed = []
+    if pending and max_workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_run_timed_job, name, data, columns) for name in pending]
+                for future in as_completed(futures):
+                    completed.append(future.result())
+        except (OSError, BrokenProcessPool):
+            # Sandboxed or fork-restricted environments: keep whatever the
+            # pool finished and run only the remaining jobs serially below
+            pass
+
+    done = {name for name, _, _ in completed}
+    for name in pending:
+        if name not in done:
+            completed.append(_run_timed_job(name, data, columns))
+
+    for name, result, seconds in completed:
+        results[name] = result
+        timings[name] = {"seconds": round(seconds, 4), "cache_hit": False}
+        if use_cache:
+            _REPORT_CACHE[(name, fingerprint)] = copy.deepcopy(result)
+
+    return results, {name: timings[name] for name in jobs}
+
+
+def generate_full_report(max_workers: int | None = None) -> Dict[str, Any]:
+    data = load_data(EXPORT_PATH)
+
+    start = time.perf_counter()
+    results, timings = run_hypothesis_jobs(
+        data, max_workers=max_workers, fingerprint=file_fingerprint(EXPORT_PATH)
+    )
+    wall_seconds = time.perf_counter() - start
+
+    report: Dict[str, Any] = {
         "dataset_info": {
             "total_tracks": len(data),
             "albums": list(set(t["album_name"] for t in data)),
             "years_span": f"{min(t['album_year'] for t in data)}-{max(t['album_year'] for t in data)}"
-        },
-        "h1_coldness_test": test_h1_coldness(data),
-        "h1_sentiment_test": test_h1_sentiment(data),
-        "h2_fragmentation_test": test_h2_fragmentation(data),
-        "h3_thematic_continuity_test": test_h3_thematic_continuity(data),
-        "h4_in_rainbows_test": test_h4_in_rainbows(data),
-        "moon_shaped_pool_analysis": analyze_moon_shaped_pool(data)
+        }
     }
+    # Keep the historical key order regardless of completion order
+    for name in [
+        "h1_coldness_test", "h1_sentiment_test", "h2_fragmentation_test",
+        "h3_thematic_continuity_test", "h4_in_rainbows_test", "moon_shaped_pool_analysis"
+    ]:
+        report[name] = results[name]
+    for name in HYPOTHESIS_JOBS:
+        if name not in report:
+            report[name] = results[name]
+
+    report["timings"] = {
+        "per_test": timings,
+        "wall_seconds": round(wall_seconds, 4)
+    }
+    return report
 
 
 if __name__ == "__main__":
@@ -411,3 +921,9 @@ if __name__ == "__main__":
 
     print("\n--- A MOON SHAPED POOL ANALYSIS ---")
     pprint.pprint(report["moon_shaped_pool_analysis"])
+
+    print("\n--- TIMINGS ---")
+    for name, timing in report["timings"]["per_test"].items():
+        status = "cache hit" if timing["cache_hit"] else f"{timing['seconds']:.3f}s"
+        print(f"  {name:<30} {status}")
+    print(f"  {'wall time':<30} {report['timings']['wall_seconds']:.3f}s")
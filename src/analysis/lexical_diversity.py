@@ -3,9 +3,10 @@ Lexical Diversity Analysis for Radiohead Lyrics.
 
 Tracks how Thom Yorke's writing evolved across albums:
 - Type-token ratio (vocabulary richness)
+- Length-robust diversity: MATTR, bidirectional MTLD and HD-D
 - Average sentence length
 - Word complexity
-- Repetition patterns
+- Repetition patterns, as an n-gram repetition spectrum
 """
 
 from __future__ import annotations
@@ -13,13 +14,31 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 
+import numpy as np
+
+from analysis.caching import corpus_fingerprint, file_fingerprint
+
+
+# Length-robust diversity parameters (conventional values from the literature)
+MATTR_WINDOW = 50
+MTLD_THRESHOLD = 0.72
+HDD_SAMPLE = 42
+
+# Highest n-gram order in the repetition spectrum
+REPETITION_MAX_N = 5
+
+# Odd 64-bit multiplier for the polynomial rolling hash (arithmetic wraps mod 2^64)
+ROLLING_HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+
+EXPORT_PATH = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+
 
 def load_data(path: Path | None = None) -> List[Dict[str, Any]]:
     if path is None:
-        path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+        path = EXPORT_PATH
 
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -39,20 +58,6 @@ def album_order() -> List[str]:
     ]
 
 
-def calculate_repetition_ratio(lyrics: str) -> float:
-    words = re.findall(r"[a-zA-Z']+", lyrics.lower())
-    if not words:
-        return 0.0
-
-    # Count bigrams
-    bigrams = [f"{words[i]} {words[i+1]}" for i in range(len(words)-1)]
-    if not bigrams:
-        return 0.0
-
-    unique_bigrams = len(set(bigrams))
-    return 1 - (unique_bigrams / len(bigrams))
-
-
 def calculate_long_word_ratio(lyrics: str, min_length: int = 7) -> float:
     words = re.findall(r"[a-zA-Z]+", lyrics.lower())
     if not words:
@@ -62,6 +67,180 @@ def calculate_long_word_ratio(lyrics: str, min_length: int = 7) -> float:
     return len(long_words) / len(words)
 
 
+def tokenize(lyrics: str) -> List[str]:
+    return re.findall(r"[a-zA-Z']+", lyrics.lower())
+
+
+def corpus_token_ids(data: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    # Whole corpus as one flat id array plus per-track offsets
+    vocab: Dict[str, int] = {}
+    ids: List[int] = []
+    offsets = [0]
+    for track in data:
+        ids.extend(vocab.setdefault(w, len(vocab)) for w in tokenize(track["lyrics"]))
+        offsets.append(len(ids))
+    return np.asarray(ids, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+
+def _occurrence_links(ids: np.ndarray, doc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Previous / next position of the same word in the same track (-1 / n if none)
+    n = len(ids)
+    keys = doc * (int(ids.max()) + 1 if n else 1) + ids
+    order = np.argsort(keys, kind="stable")
+    same = keys[order[1:]] == keys[order[:-1]]
+    prev = np.full(n, -1, dtype=np.int64)
+    nxt = np.full(n, n, dtype=np.int64)
+    prev[order[1:][same]] = order[:-1][same]
+    nxt[order[:-1][same]] = order[1:][same]
+    return prev, nxt
+
+
+def mattr_scores(ids: np.ndarray, offsets: np.ndarray, window: int = MATTR_WINDOW) -> np.ndarray:
+    """
+    Moving-average TTR for every track in O(total tokens).
+
+    Sliding the window one step drops a word (a lost type only if it does not
+    recur inside the new window) and adds one (a new type only if it did not
+    occur inside the old one), so window type counts are a running sum of
+    +/-1 updates. Tracks shorter than the window fall back to plain TTR.
+    """
+    n_docs = len(offsets) - 1
+    lengths = np.diff(offsets)
+    doc = np.repeat(np.arange(n_docs), lengths)
+    local = np.arange(len(ids)) - offsets[doc]
+    prev, nxt = _occurrence_links(ids, doc)
+    pos = np.arange(len(ids))
+
+    new_type = prev == -1
+    ttr = np.bincount(doc, weights=new_type, minlength=n_docs) / np.maximum(lengths, 1)
+
+    long_doc = lengths[doc] >= window
+    initial = np.bincount(doc, weights=new_type & (local < window) & long_doc, minlength=n_docs)
+
+    # Type-count change when the window slides from start p to p + 1
+    slides = long_doc & (local < lengths[doc] - window)
+    entering = np.minimum(pos + window, len(ids) - 1)
+    delta = np.where(
+        slides,
+        (prev[entering] <= pos).astype(np.int64) - (nxt >= pos + window).astype(np.int64),
+        0
+    )
+    before = np.concatenate([[0], np.cumsum(delta)[:-1]])
+    window_types = initial[doc] + before - before[offsets[doc]]
+
+    starts = long_doc & (local <= lengths[doc] - window)
+    totals = np.bincount(doc, weights=np.where(starts, window_types, 0), minlength=n_docs)
+    n_windows = np.maximum(lengths - window + 1, 1)
+    return np.where(lengths >= window, totals / n_windows / window, ttr)
+
+
+def _mtld_pass(tokens: List[int], threshold: float) -> float:
+    factors, types, count = 0.0, set(), 0
+    for token in tokens:
+        count += 1
+        types.add(token)
+        if len(types) / count <= threshold:
+            factors += 1
+            types, count = set(), 0
+    if count:
+        factors += (1 - len(types) / count) / (1 - threshold)
+    # No completed or partial factor means every word was new
+    return len(tokens) / factors if factors else float(len(tokens))
+
+
+def mtld_scores(ids: np.ndarray, offsets: np.ndarray, threshold: float = MTLD_THRESHOLD) -> np.ndarray:
+    # Factor resets make MTLD sequential; each pass is still one linear scan
+    scores = np.zeros(len(offsets) - 1)
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        tokens = ids[start:end].tolist()
+        if tokens:
+            scores[i] = (_mtld_pass(tokens, threshold) + _mtld_pass(tokens[::-1], threshold)) / 2
+    return scores
+
+
+def hdd_scores(ids: np.ndarray, offsets: np.ndarray, sample: int = HDD_SAMPLE) -> np.ndarray:
+    """
+    HD-D: expected TTR of a random `sample`-word draw, summed over word types.
+
+    P(word absent from the draw) is hypergeometric; it is read from one
+    log-factorial table for every (track, word) pair at once. Tracks shorter
+    than the sample draw every word, which reduces to plain TTR.
+    """
+    n_docs = len(offsets) - 1
+    lengths = np.diff(offsets)
+    doc = np.repeat(np.arange(n_docs), lengths)
+    if not len(ids):
+        return np.zeros(n_docs)
+
+    pairs, counts = np.unique(doc * (int(ids.max()) + 1) + ids, return_counts=True)
+    pair_doc = pairs // (int(ids.max()) + 1)
+
+    log_fact = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, int(lengths.max()) + 1)))])
+    n = lengths[pair_doc]
+    k = np.minimum(sample, n)
+    rest = n - counts
+    # P(X = 0) = C(n - c, k) / C(n, k)
+    feasible = rest >= k
+    safe_rest = np.where(feasible, rest, k)
+    log_p0 = log_fact[safe_rest] + log_fact[n - k] - log_fact[safe_rest - k] - log_fact[n]
+    p_absent = np.where(feasible, np.exp(log_p0), 0.0)
+
+    return np.bincount(pair_doc, weights=(1 - p_absent) / k, minlength=n_docs)
+
+
+def repetition_spectrum(ids: np.ndarray, offsets: np.ndarray, max_n: int = REPETITION_MAX_N) -> np.ndarray:
+    """
+    Repetition ratio 1 - unique/total n-grams for n = 1..max_n, per track.
+
+    Order-n hashes extend the order-(n-1) hashes by one token, so the whole
+    spectrum is max_n vectorized passes over the id array with no strings.
+    """
+    n_docs = len(offsets) - 1
+    lengths = np.diff(offsets)
+    doc = np.repeat(np.arange(n_docs), lengths)
+    local = np.arange(len(ids)) - offsets[doc]
+    spectrum = np.zeros((n_docs, max_n))
+
+    hashes = np.zeros(len(ids), dtype=np.uint64)
+    symbols = ids.astype(np.uint64) + np.uint64(1)
+    for n in range(1, max_n + 1):
+        # hash of the n-gram starting at p, valid while p + n stays in the track
+        valid = local <= lengths[doc] - n
+        starts = np.nonzero(valid)[0]
+        hashes[starts] = hashes[starts] * ROLLING_HASH_BASE + symbols[starts + n - 1]
+
+        gram_doc, gram_hash = doc[starts], hashes[starts]
+        order = np.lexsort((gram_hash, gram_doc))
+        gram_doc, gram_hash = gram_doc[order], gram_hash[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (gram_doc[1:] != gram_doc[:-1]) | (gram_hash[1:] != gram_hash[:-1])
+
+        total = np.bincount(gram_doc, minlength=n_docs)
+        unique = np.bincount(gram_doc[first], minlength=n_docs)
+        spectrum[:, n - 1] = np.where(total > 0, 1 - unique / np.maximum(total, 1), 0.0)
+
+    return spectrum
+
+
+def corpus_lexical_metrics(data: List[Dict[str, Any]], max_n: int = REPETITION_MAX_N) -> List[Dict[str, Any]]:
+    # One tokenization of the corpus shared by every vectorized metric
+    ids, offsets = corpus_token_ids(data)
+    mattr = mattr_scores(ids, offsets)
+    mtld = mtld_scores(ids, offsets)
+    hdd = hdd_scores(ids, offsets)
+    spectrum = repetition_spectrum(ids, offsets, max_n)
+    return [
+        {
+            "mattr": round(float(a), 4),
+            "mtld": round(float(b), 2),
+            "hdd": round(float(c), 4),
+            "repetition": float(reps[1]) if max_n >= 2 else 0.0,
+            "repetition_spectrum": [round(float(r), 4) for r in reps]
+        }
+        for a, b, c, reps in zip(mattr, mtld, hdd, spectrum)
+    ]
+
+
 def group_by_album(data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     albums = defaultdict(list)
     for track in data:
@@ -69,40 +248,93 @@ def group_by_album(data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]
     return dict(albums)
 
 
-def calculate_album_metrics(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    by_album = group_by_album(data)
+# Per-track metrics tables keyed by corpus content hash
+_TRACK_TABLE_CACHE: Dict[str, List[Dict[str, Any]]] = {}
+
+
+def _track_metrics_table(
+    data: List[Dict[str, Any]],
+    use_cache: bool = True,
+    fingerprint: str | None = None
+) -> List[Dict[str, Any]]:
+    # Every per-track metric in one pass; album and evolution views aggregate this.
+    # Returns the cached rows themselves, so public callers hand out copies
+    if fingerprint is None:
+        fingerprint = corpus_fingerprint(data)
+    if use_cache and fingerprint in _TRACK_TABLE_CACHE:
+        return _TRACK_TABLE_CACHE[fingerprint]
+
+    table = []
+    for track, metrics in zip(data, corpus_lexical_metrics(data)):
+        table.append({
+            "track": track["track_name"],
+            "album": track["album_name"],
+            "year": track["album_year"],
+            "era": track["era"],
+            "type_token_ratio": track["type_token_ratio"],
+            "avg_sentence_length": track["avg_sentence_length"],
+            "avg_token_length": track["avg_token_length"],
+            "word_count": track["word_count"],
+            "repetition": metrics["repetition"],
+            "long_word_ratio": calculate_long_word_ratio(track["lyrics"]),
+            "mattr": metrics["mattr"],
+            "mtld": metrics["mtld"],
+            "hdd": metrics["hdd"],
+            # Tuple, so rows handed out from the cache can't share a mutable list
+            "repetition_spectrum": tuple(metrics["repetition_spectrum"])
+        })
+
+    if use_cache:
+        _TRACK_TABLE_CACHE[fingerprint] = table
+    return table
+
+
+def _load_table() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # The default export is keyed by its file stamp rather than by content
+    data = load_data(EXPORT_PATH)
+    return data, _track_metrics_table(data, fingerprint=file_fingerprint(EXPORT_PATH))
+
+
+def calculate_album_metrics(
+    data: List[Dict[str, Any]],
+    table: List[Dict[str, Any]] | None = None
+) -> List[Dict[str, Any]]:
+    if table is None:
+        table = _track_metrics_table(data)
+    by_album = defaultdict(list)
+    for row in table:
+        by_album[row["album"]].append(row)
 
     results = []
     for album in album_order():
         if album not in by_album:
             continue
 
-        tracks = by_album[album]
-
-        # Extract existing metrics
-        ttr_values = [t["type_token_ratio"] for t in tracks]
-        sentence_len_values = [t["avg_sentence_length"] for t in tracks]
-        token_len_values = [t["avg_token_length"] for t in tracks]
-        word_counts = [t["word_count"] for t in tracks]
+        rows = by_album[album]
 
-        # Calculate additional metrics
-        repetition_values = [calculate_repetition_ratio(t["lyrics"]) for t in tracks]
-        long_word_values = [calculate_long_word_ratio(t["lyrics"]) for t in tracks]
-
-        year = tracks[0]["album_year"]
-        era = tracks[0]["era"]
+        ttr_values = [r["type_token_ratio"] for r in rows]
+        sentence_len_values = [r["avg_sentence_length"] for r in rows]
+        token_len_values = [r["avg_token_length"] for r in rows]
+        word_counts = [r["word_count"] for r in rows]
+        repetition_values = [r["repetition"] for r in rows]
+        long_word_values = [r["long_word_ratio"] for r in rows]
+        spectra = np.array([r["repetition_spectrum"] for r in rows])
 
         results.append({
             "album": album,
-            "year": year,
-            "era": era,
-            "track_count": len(tracks),
+            "year": rows[0]["year"],
+            "era": rows[0]["era"],
+            "track_count": len(rows),
             "avg_type_token_ratio": round(sum(ttr_values) / len(ttr_values), 4),
             "avg_sentence_length": round(sum(sentence_len_values) / len(sentence_len_values), 2),
             "avg_token_length": round(sum(token_len_values) / len(token_len_values), 3),
             "avg_word_count": round(sum(word_counts) / len(word_counts), 1),
             "avg_repetition": round(sum(repetition_values) / len(repetition_values), 4),
+            "avg_repetition_spectrum": [round(float(v), 4) for v in spectra.mean(axis=0)],
             "avg_long_word_ratio": round(sum(long_word_values) / len(long_word_values), 4),
+            "avg_mattr": round(sum(r["mattr"] for r in rows) / len(rows), 4),
+            "avg_mtld": round(sum(r["mtld"] for r in rows) / len(rows), 2),
+            "avg_hdd": round(sum(r["hdd"] for r in rows) / len(rows), 4),
             "min_ttr": round(min(ttr_values), 4),
             "max_ttr": round(max(ttr_values), 4)
         })
@@ -110,9 +342,16 @@ def calculate_album_metrics(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return results
 
 
-def analyze_evolution() -> Dict[str, Any]:
-    data = load_data()
-    album_metrics = calculate_album_metrics(data)
+def analyze_evolution(
+    data: List[Dict[str, Any]] | None = None,
+    album_metrics: List[Dict[str, Any]] | None = None
+) -> Dict[str, Any]:
+    if album_metrics is None:
+        if data is None:
+            data, table = _load_table()
+            album_metrics = calculate_album_metrics(data, table)
+        else:
+            album_metrics = calculate_album_metrics(data)
 
     # Group into early vs late
     early_albums = ["Pablo Honey", "The Bends", "OK Computer"]
@@ -143,34 +382,29 @@ def analyze_evolution() -> Dict[str, Any]:
     }
 
 
-def get_track_level_metrics(data: List[Dict[str, Any]] | None = None) -> List[Dict[str, Any]]:
-    if data is None:
-        data = load_data()
+def get_track_level_metrics(
+    data: List[Dict[str, Any]] | None = None,
+    table: List[Dict[str, Any]] | None = None
+) -> List[Dict[str, Any]]:
+    if table is None:
+        table = _track_metrics_table(data) if data is not None else _load_table()[1]
 
-    results = []
-    for track in data:
-        results.append({
-            "track": track["track_name"],
-            "album": track["album_name"],
-            "year": track["album_year"],
-            "type_token_ratio": track["type_token_ratio"],
-            "avg_sentence_length": track["avg_sentence_length"],
-            "avg_token_length": track["avg_token_length"],
-            "word_count": track["word_count"],
-            "repetition": calculate_repetition_ratio(track["lyrics"]),
-            "long_word_ratio": calculate_long_word_ratio(track["lyrics"])
-        })
-
-    return results
+    # Copies, so callers can't mutate the cached table
+    return [
+        {k: list(v) if isinstance(v, tuple) else v for k, v in row.items() if k != "era"}
+        for row in table
+    ]
 
 
 def export_for_web() -> Dict[str, Any]:
-    data = load_data()
+    # Build the table once for all three views
+    data, table = _load_table()
+    album_metrics = calculate_album_metrics(data, table)
 
     return {
-        "album_metrics": calculate_album_metrics(data),
-        "track_metrics": get_track_level_metrics(data),
-        "evolution": analyze_evolution()
+        "album_metrics": album_metrics,
+        "track_metrics": get_track_level_metrics(data, table),
+        "evolution": analyze_evolution(data, album_metrics)
     }
 
 
@@ -189,6 +423,13 @@ if __name__ == "__main__":
         print(f"{m['album']:<25} {m['year']:<6} {m['avg_type_token_ratio']:<8} "
               f"{m['avg_sentence_length']:<10} {m['avg_repetition']:<10}")
 
+    print("\n--- LENGTH-ROBUST DIVERSITY ---")
+    print(f"{'Album':<25} {'MATTR':<8} {'MTLD':<8} {'HD-D':<8}")
+    print("-" * 70)
+
+    for m in evolution["album_metrics"]:
+        print(f"{m['album']:<25} {m['avg_mattr']:<8} {m['avg_mtld']:<8} {m['avg_hdd']:<8}")
+
     print(f"\n--- EVOLUTION SUMMARY ---")
     summary = evolution["evolution_summary"]
     print(f"Early era TTR (avg): {summary['early_avg_ttr']}")
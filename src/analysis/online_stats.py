@@ -0,0 +1,360 @@
+"""
+Online Hypothesis Statistics for Radiohead Lyrics Analysis.
+
+Keeps the H1/H2/H4 comparisons up to date as tracks are added, corrected or
+removed, without re-reading the corpus:
+
+- Welford accumulators for running group means and variances
+- Order-statistic trees (treaps) per group for the Mann-Whitney U statistic
+- Running tie-correction term for the normal approximation
+
+Each track update costs O(log n) per affected comparison.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Dict, List, Any, Tuple
+from collections import defaultdict
+
+from analysis.hypothesis_tests import (
+    HYPOTHESIS_SPECS,
+    SPECS_BY_ID,
+    apply_corrections,
+    mwu_p_value,
+    track_in_group,
+    track_metric,
+)
+
+
+# Specs maintained by default: the H1, H2 and H4 comparisons
+ONLINE_SPEC_IDS = [
+    spec["id"] for spec in HYPOTHESIS_SPECS if spec["family"] in {"h1", "h2", "h4"}
+]
+
+# Album-level means reported alongside the tests
+ONLINE_ALBUM_METRICS = [
+    "coldness_index", "sentiment_score", "type_token_ratio",
+    "avg_sentence_length", "warmth", "emotion_joy"
+]
+
+
+class WelfordAccumulator:
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x: float) -> None:
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.n -= 1
+        self.mean = (old_mean * (self.n + 1) - x) / self.n
+        self.m2 = max(self.m2 - (x - old_mean) * (x - self.mean), 0.0)
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else 0.0
+
+
+class _Node:
+    __slots__ = ("key", "priority", "count", "size", "left", "right")
+
+    def __init__(self, key: float) -> None:
+        self.key = key
+        self.priority = random.random()
+        self.count = 1
+        self.size = 1
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+
+def _size(node: _Node | None) -> int:
+    return node.size if node else 0
+
+
+def _update(node: _Node) -> None:
+    node.size = node.count + _size(node.left) + _size(node.right)
+
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    node.left, left.right = left.right, node
+    _update(node)
+    _update(left)
+    return left
+
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    node.right, right.left = right.left, node
+    _update(node)
+    _update(right)
+    return right
+
+
+class OrderStatisticTree:
+    """Treap multiset with subtree sizes; all operations are O(log n) expected."""
+
+    def __init__(self) -> None:
+        self.root: _Node | None = None
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def insert(self, key: float) -> None:
+        self.root = self._insert(self.root, key)
+
+    def _insert(self, node: _Node | None, key: float) -> _Node:
+        if node is None:
+            return _Node(key)
+        if key == node.key:
+            node.count += 1
+        elif key < node.key:
+            node.left = self._insert(node.left, key)
+            if node.left.priority > node.priority:
+                node = _rotate_right(node)
+        else:
+            node.right = self._insert(node.right, key)
+            if node.right.priority > node.priority:
+                node = _rotate_left(node)
+        _update(node)
+        return node
+
+    def remove(self, key: float) -> None:
+        self.root = self._remove(self.root, key)
+
+    def _remove(self, node: _Node | None, key: float) -> _Node | None:
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        elif node.count > 1:
+            node.count -= 1
+        elif node.left is None or node.right is None:
+            return node.left or node.right
+        else:
+            # Rotate the node down towards a leaf, then remove it there
+            if node.left.priority > node.right.priority:
+                node = _rotate_right(node)
+                node.right = self._remove(node.right, key)
+            else:
+                node = _rotate_left(node)
+                node.left = self._remove(node.left, key)
+        _update(node)
+        return node
+
+    def count_less(self, key: float) -> int:
+        node, total = self.root, 0
+        while node:
+            if key <= node.key:
+                node = node.left
+            else:
+                total += _size(node.left) + node.count
+                node = node.right
+        return total
+
+    def count_equal(self, key: float) -> int:
+        node = self.root
+        while node:
+            if key == node.key:
+                return node.count
+            node = node.left if key < node.key else node.right
+        return 0
+
+    def count_greater(self, key: float) -> int:
+        return len(self) - self.count_less(key) - self.count_equal(key)
+
+    def select(self, k: int) -> float:
+        # k-th smallest value, 0-based
+        node = self.root
+        while node:
+            left = _size(node.left)
+            if k < left:
+                node = node.left
+            elif k < left + node.count:
+                return node.key
+            else:
+                k -= left + node.count
+                node = node.right
+        raise IndexError(k)
+
+
+class OnlineMannWhitney:
+    """Two-sample Mann-Whitney U maintained under insertions and deletions."""
+
+    def __init__(self) -> None:
+        self.trees = (OrderStatisticTree(), OrderStatisticTree())
+        self.moments = (WelfordAccumulator(), WelfordAccumulator())
+        self.u1 = 0.0
+        self.tie_term = 0.0
+        self.value_counts: Dict[float, int] = defaultdict(int)
+
+    def _score_against(self, group: int, x: float) -> float:
+        # Contribution of x in `group` to U1: wins of group 1 over group 2
+        if group == 0:
+            other = self.trees[1]
+            return other.count_less(x) + 0.5 * other.count_equal(x)
+        other = self.trees[0]
+        return other.count_greater(x) + 0.5 * other.count_equal(x)
+
+    def _adjust_ties(self, x: float, delta: int) -> None:
+        # sum(t^3 - t) over tie blocks, updated for the block containing x
+        t = self.value_counts[x]
+        self.tie_term -= t ** 3 - t
+        t += delta
+        self.tie_term += t ** 3 - t
+        if t:
+            self.value_counts[x] = t
+        else:
+            del self.value_counts[x]
+
+    def add(self, group: int, x: float) -> None:
+        self.u1 += self._score_against(group, x)
+        self.trees[group].insert(x)
+        self.moments[group].add(x)
+        self._adjust_ties(x, 1)
+
+    def remove(self, group: int, x: float) -> None:
+        self.trees[group].remove(x)
+        self.moments[group].remove(x)
+        self.u1 -= self._score_against(group, x)
+        self._adjust_ties(x, -1)
+
+    def effect_size_cohens_d(self) -> float:
+        a, b = self.moments
+        if not a.n or not b.n:
+            return 0.0
+        pooled_std = ((a.variance() * a.n + b.variance() * b.n) / (a.n + b.n)) ** 0.5
+        if pooled_std == 0:
+            return 0.0
+        return round((a.mean - b.mean) / pooled_std, 4)
+
+    def result(self) -> Dict[str, Any]:
+        n1, n2 = len(self.trees[0]), len(self.trees[1])
+        if n1 < 3 or n2 < 3:
+            return {"error": "Too few samples", "u_statistic": None, "p_value": None}
+
+        p_value = mwu_p_value(self.u1, n1, n2, self.tie_term)
+        return {
+            "u_statistic": round(self.u1, 4),
+            "p_value": round(p_value, 6),
+            "significant_05": p_value < 0.05,
+            "significant_01": p_value < 0.01,
+            "group1_median": round(self.trees[0].select(n1 // 2), 4),
+            "group2_median": round(self.trees[1].select(n2 // 2), 4),
+            "group1_mean": round(self.moments[0].mean, 4),
+            "group2_mean": round(self.moments[1].mean, 4),
+            "group1_n": n1,
+            "group2_n": n2
+        }
+
+
+def track_key(track: Dict[str, Any]) -> Tuple[str, str]:
+    return track["album_name"], track["track_name"]
+
+
+class OnlineHypothesisMonitor:
+    """Incrementally maintained hypothesis comparisons and album means."""
+
+    def __init__(
+        self,
+        spec_ids: List[str] | None = None,
+        album_metrics: List[str] | None = None
+    ) -> None:
+        self.specs = [SPECS_BY_ID[i] for i in (spec_ids or ONLINE_SPEC_IDS)]
+        self.album_metrics = album_metrics or ONLINE_ALBUM_METRICS
+        self.tests = {spec["id"]: OnlineMannWhitney() for spec in self.specs}
+        self.album_moments: Dict[str, Dict[str, WelfordAccumulator]] = defaultdict(
+            lambda: {m: WelfordAccumulator() for m in self.album_metrics}
+        )
+        self.tracks: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    @classmethod
+    def from_tracks(cls, data: List[Dict[str, Any]], **kwargs: Any) -> "OnlineHypothesisMonitor":
+        monitor = cls(**kwargs)
+        for track in data:
+            monitor.upsert_track(track)
+        return monitor
+
+    def _apply(self, track: Dict[str, Any], sign: int) -> None:
+        # Missing and NaN values are left out, as the batch engine does
+        for spec in self.specs:
+            value = track_metric(track, spec["metric"])
+            if value is None or math.isnan(value):
+                continue
+            test = self.tests[spec["id"]]
+            for group, selector in enumerate((spec["group1"], spec["group2"])):
+                if track_in_group(track, selector):
+                    (test.add if sign > 0 else test.remove)(group, float(value))
+
+        moments = self.album_moments[track["album_name"]]
+        for metric in self.album_metrics:
+            value = track.get(metric)
+            if value is not None and not math.isnan(value):
+                acc = moments[metric]
+                (acc.add if sign > 0 else acc.remove)(float(value))
+
+    def upsert_track(self, track: Dict[str, Any], replaces: Tuple[str, str] | None = None) -> None:
+        # `replaces` is the (album, track) key the record was stored under
+        # before a correction that renamed it or moved it to another album
+        key = track_key(track)
+        for old_key in {key, replaces or key}:
+            if old_key in self.tracks:
+                self._apply(self.tracks.pop(old_key), -1)
+        self.tracks[key] = dict(track)
+        self._apply(track, 1)
+
+    def remove_track(self, track: Dict[str, Any]) -> None:
+        key = track_key(track)
+        self._apply(self.tracks.pop(key), -1)
+
+    def album_means(self, metric: str) -> Dict[str, float]:
+        return {
+            album: moments[metric].mean
+            for album, moments in self.album_moments.items()
+            if moments[metric].n
+        }
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        results = {
+            spec["id"]: {
+                "metric": spec["metric"],
+                "group1": spec["group1"],
+                "group2": spec["group2"],
+                "results": self.tests[spec["id"]].result(),
+                "effect_size_cohens_d": self.tests[spec["id"]].effect_size_cohens_d()
+            }
+            for spec in self.specs
+        }
+        apply_corrections(self.specs, results)
+        return results
+
+
+if __name__ == "__main__":
+    from analysis.hypothesis_tests import load_data
+
+    print("=" * 70)
+    print("RADIOHEAD ONLINE HYPOTHESIS STATISTICS")
+    print("=" * 70)
+
+    data = load_data()
+    monitor = OnlineHypothesisMonitor.from_tracks(data)
+
+    print(f"\n{len(monitor.tracks)} tracks folded in\n")
+    for spec_id, result in monitor.results().items():
+        test = result["results"]
+        adjusted = f" p_adj={test['p_adjusted']}" if "p_adjusted" in test else ""
+        print(f"  {spec_id:<36} U={test['u_statistic']!s:<8} p={test['p_value']}{adjusted}")
@@ -0,0 +1,219 @@
+"""
+Multivariate Album Outlier Scoring.
+
+Answers H4 directly: which album is the real statistical outlier once every
+lyric-content feature is considered, not just sentiment?
+
+- Album x feature matrix of per-album means over the lyric-content features
+- Leave-one-album-out Mahalanobis distance (ridge-regularized, closed form)
+- Robust z distance from the catalog median / MAD
+- Shift magnitude from the previous album in chronological order
+
+All scores are computed in a single vectorized pass, so the cost grows with
+albums x features rather than with pairwise album comparisons.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+from collections import defaultdict
+
+import numpy as np
+
+
+# Lyric-content features scored by default. Raw size counts (characters,
+# words, lines, ...) would make the score mostly measure song length, and
+# derived columns such as coldness_index or sentiment_score duplicate inputs
+# already listed here
+LYRIC_FEATURES = [
+    "type_token_ratio", "avg_token_length", "avg_sentence_length",
+    "vader_compound", "vader_positive", "vader_negative",
+    "emotion_joy", "emotion_sadness", "emotion_anger", "emotion_fear",
+    "emotion_disgust", "emotion_surprise", "emotion_trust", "emotion_anticipation",
+    "coldness", "warmth", "alienation", "connection", "emotional_intensity"
+]
+
+# MAD -> standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+
+
+def load_data(path: Path | None = None) -> List[Dict[str, Any]]:
+    if path is None:
+        path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def numeric_feature_names(data: List[Dict[str, Any]]) -> List[str]:
+    # The default features every track carries as a number
+    return [
+        f for f in LYRIC_FEATURES
+        if data and all(isinstance(t.get(f), (int, float)) and not isinstance(t.get(f), bool) for t in data)
+    ]
+
+
+def album_feature_matrix(
+    data: List[Dict[str, Any]],
+    features: List[str] | None = None,
+    group_key: str = "album_name"
+) -> Tuple[List[str], List[int], List[str], np.ndarray]:
+    if features is None:
+        features = numeric_feature_names(data)
+
+    rows = defaultdict(list)
+    years = {}
+    for track in data:
+        album = track[group_key]
+        rows[album].append([float(track[f]) for f in features])
+        years.setdefault(album, track.get("album_year", 0))
+
+    # Chronological order defines adjacency
+    albums = sorted(rows, key=lambda a: (years[a], a))
+    matrix = np.array([np.mean(rows[a], axis=0) for a in albums]).reshape(len(albums), len(features))
+    return albums, [years[a] for a in albums], features, matrix
+
+
+def standardize_columns(matrix: np.ndarray, features: List[str]) -> Tuple[np.ndarray, List[str]]:
+    std = matrix.std(axis=0)
+    keep = std > 0
+    z = (matrix[:, keep] - matrix[:, keep].mean(axis=0)) / std[keep]
+    return z, [f for f, k in zip(features, keep) if k]
+
+
+def leave_one_out_mahalanobis(z: np.ndarray, ridge: float = 0.1) -> np.ndarray:
+    n_albums, n_features = z.shape
+    if n_albums < 3 or n_features == 0:
+        return np.zeros(n_albums)
+
+    centered = z - z.mean(axis=0)
+    scatter = centered.T @ centered
+    # Ridge keeps the covariance invertible when features outnumber albums
+    lam = ridge * np.trace(scatter) / n_features
+    regularized = scatter + lam * np.eye(n_features)
+
+    # Leverage h_i = v_i^T M^-1 v_i for every album at once
+    leverage = np.einsum("ij,ji->i", centered, np.linalg.solve(regularized, centered.T))
+
+    # Removing album i is a rank-one downdate of the scatter matrix, so the
+    # leave-one-out distance follows from Sherman-Morrison without refitting:
+    # x_i - mean_{-i} = c * v_i, scatter_{-i} = scatter - c * v_i v_i^T
+    c = n_albums / (n_albums - 1)
+    denom = np.maximum(1 - c * leverage, 1e-12)
+    d2 = (n_albums - 2) * c ** 2 * leverage / denom
+    return np.sqrt(d2)
+
+
+def robust_z_scores(z: np.ndarray) -> np.ndarray:
+    median = np.median(z, axis=0)
+    mad = MAD_SCALE * np.median(np.abs(z - median), axis=0)
+    # Fall back to the column standard deviation where most albums tie
+    scale = np.where(mad > 0, mad, z.std(axis=0))
+    scale[scale == 0] = 1.0
+    return (z - median) / scale
+
+
+def adjacent_shifts(z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n_albums, n_features = z.shape
+    steps = np.linalg.norm(np.diff(z, axis=0), axis=1) / np.sqrt(max(n_features, 1))
+    shift_in = np.concatenate([[np.nan], steps])
+    shift_out = np.concatenate([steps, [np.nan]])
+    return shift_in, shift_out
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    # 1 = most outlying; NaN scores rank last
+    filled = np.where(np.isnan(values), -np.inf, values)
+    order = np.argsort(-filled, kind="mergesort")
+    ranks = np.empty(len(values), dtype=int)
+    ranks[order] = np.arange(1, len(values) + 1)
+    return ranks
+
+
+def score_album_outliers(
+    data: List[Dict[str, Any]],
+    features: List[str] | None = None,
+    group_key: str = "album_name",
+    ridge: float = 0.1,
+    top_features: int = 3
+) -> Dict[str, Any]:
+    albums, years, features, matrix = album_feature_matrix(data, features, group_key)
+    z, used = standardize_columns(matrix, features)
+
+    mahalanobis = leave_one_out_mahalanobis(z, ridge=ridge)
+    robust = robust_z_scores(z)
+    robust_distance = np.sqrt((robust ** 2).mean(axis=1)) if used else np.zeros(len(albums))
+    shift_in, shift_out = adjacent_shifts(z)
+
+    maha_rank = _ranks(mahalanobis)
+    robust_rank = _ranks(robust_distance)
+    shift_rank = _ranks(shift_in)
+
+    # Top contributing features per album by |robust z|
+    driver_idx = np.argsort(-np.abs(robust), axis=1)[:, :top_features]
+
+    scores = []
+    for i, album in enumerate(albums):
+        scores.append({
+            "album": album,
+            "year": years[i],
+            "mahalanobis_loo": round(float(mahalanobis[i]), 4),
+            "robust_z_distance": round(float(robust_distance[i]), 4),
+            "shift_from_previous": None if np.isnan(shift_in[i]) else round(float(shift_in[i]), 4),
+            "shift_to_next": None if np.isnan(shift_out[i]) else round(float(shift_out[i]), 4),
+            "mahalanobis_rank": int(maha_rank[i]),
+            "robust_z_rank": int(robust_rank[i]),
+            "shift_from_previous_rank": int(shift_rank[i]),
+            "top_features": [
+                {"feature": used[j], "robust_z": round(float(robust[i, j]), 3)}
+                for j in driver_idx[i]
+            ]
+        })
+
+    ranking = sorted(scores, key=lambda s: s["mahalanobis_rank"])
+
+    return {
+        "method": "Leave-one-album-out Mahalanobis (ridge-regularized) + robust z + adjacent shifts",
+        "features": used,
+        "n_albums": len(albums),
+        "ranking": ranking,
+        "most_outlying_album": ranking[0]["album"] if ranking else None,
+        "largest_adjacent_shift_album": (
+            min(scores, key=lambda s: s["shift_from_previous_rank"])["album"] if scores else None
+        )
+    }
+
+
+def compare_albums(outliers: Dict[str, Any], album_a: str, album_b: str) -> Dict[str, Any]:
+    by_album = {s["album"]: s for s in outliers["ranking"]}
+    if album_a not in by_album or album_b not in by_album:
+        return {"error": "Album not found in outlier scores"}
+
+    a, b = by_album[album_a], by_album[album_b]
+    return {
+        "albums": [album_a, album_b],
+        "more_outlying_mahalanobis": album_a if a["mahalanobis_rank"] < b["mahalanobis_rank"] else album_b,
+        "more_outlying_robust_z": album_a if a["robust_z_rank"] < b["robust_z_rank"] else album_b,
+        "larger_shift_from_previous": album_a if a["shift_from_previous_rank"] < b["shift_from_previous_rank"] else album_b
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("RADIOHEAD MULTIVARIATE ALBUM OUTLIERS")
+    print("=" * 70)
+
+    outliers = score_album_outliers(load_data())
+
+    print(f"\n{len(outliers['features'])} features across {outliers['n_albums']} albums\n")
+    print(f"{'Album':<22} {'Mahal.':<8} {'RobustZ':<8} {'Shift':<8} Drivers")
+    print("-" * 70)
+    for s in outliers["ranking"]:
+        shift = s["shift_from_previous"] if s["shift_from_previous"] is not None else "-"
+        drivers = ", ".join(f["feature"] for f in s["top_features"])
+        print(f"{s['album']:<22} {s['mahalanobis_loo']:<8} {s['robust_z_distance']:<8} {shift!s:<8} {drivers}")
+
+    print(f"\nMost outlying album: {outliers['most_outlying_album']}")
+    print(f"Largest adjacent shift: {outliers['largest_adjacent_shift_album']}")
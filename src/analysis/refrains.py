@@ -0,0 +1,192 @@
+"""
+Chorus and Refrain Detection for Radiohead Lyrics.
+
+Finds the repeated segments inside each lyric - choruses, refrains and
+mantras such as "everything in its right place" - from a suffix array:
+
+- Suffix array over token ids by prefix doubling (O(n log n) sorts)
+- LCP array by Kasai's algorithm (O(n))
+- Maximal repeats from the LCP intervals, ranked by length and by count
+- Refrain coverage: the fraction of a lyric inside a repeated segment
+
+Coverage is the structural "fragmentation" signal used by H2.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Any, Tuple
+from collections import defaultdict
+
+import numpy as np
+
+from analysis.lexical_diversity import album_order, load_data, tokenize
+
+
+# Shortest token run that counts as a refrain ("I'm not here")
+REFRAIN_MIN_TOKENS = 3
+
+
+def suffix_array(ids: np.ndarray) -> np.ndarray:
+    n = len(ids)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    _, rank = np.unique(ids, return_inverse=True)
+    rank = rank.astype(np.int64)
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while k < n:
+        # Sort by (rank of first k tokens, rank of next k); -1 sorts shorter suffixes first
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        r, s = rank[sa], second[sa]
+        new = np.concatenate([[0], np.cumsum((r[1:] != r[:-1]) | (s[1:] != s[:-1]))])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = new
+        if new[-1] == n - 1:
+            break
+        k *= 2
+    return sa
+
+
+def lcp_array(ids: np.ndarray, sa: np.ndarray) -> np.ndarray:
+    # lcp[i] = common prefix length of suffixes sa[i - 1] and sa[i]; lcp[0] = 0
+    n = len(ids)
+    tokens, order = ids.tolist(), sa.tolist()
+    rank = [0] * n
+    for i, p in enumerate(order):
+        rank[p] = i
+
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        if rank[i] == 0:
+            h = 0
+            continue
+        j = order[rank[i] - 1]
+        while i + h < n and j + h < n and tokens[i + h] == tokens[j + h]:
+            h += 1
+        lcp[rank[i]] = h
+        if h:
+            h -= 1
+    return np.asarray(lcp, dtype=np.int64)
+
+
+def _covered_tokens(positions: List[int], length: int) -> int:
+    # Size of the union of [p, p + length) over sorted start positions
+    covered = 0
+    for here, after in zip(positions, positions[1:] + [None]):
+        covered += length if after is None else min(length, after - here)
+    return covered
+
+
+def repeated_segments(
+    ids: np.ndarray,
+    sa: np.ndarray,
+    lcp: np.ndarray,
+    min_len: int = REFRAIN_MIN_TOKENS
+) -> List[Tuple[int, List[int]]]:
+    """Maximal repeats as (length, sorted start positions), from the LCP intervals."""
+    n = len(ids)
+    segments = []
+    stack = [(0, 0)]  # (lcp value, left bound)
+    for i in range(1, n + 1):
+        current = int(lcp[i]) if i < n else 0
+        left = i - 1
+        while current < stack[-1][0]:
+            length, left = stack.pop()
+            if length >= min_len:
+                positions = sorted(int(p) for p in sa[left:i])
+                # Left-maximal: the occurrences are not all preceded by the same token
+                preceding = {int(ids[p - 1]) if p else -1 for p in positions}
+                if len(preceding) > 1 or -1 in preceding:
+                    segments.append((length, positions))
+        if current > stack[-1][0]:
+            stack.append((current, left))
+    return segments
+
+
+def coverage_from_lcp(sa: np.ndarray, lcp: np.ndarray, min_len: int = REFRAIN_MIN_TOKENS) -> float:
+    n = len(sa)
+    if n == 0:
+        return 0.0
+    # Longest repeat starting at each position: best LCP with either suffix-array neighbour
+    neighbor = np.maximum(lcp, np.concatenate([lcp[1:], [0]]))
+    repeat_len = np.empty(n, dtype=np.int64)
+    repeat_len[sa] = neighbor
+
+    positions = np.arange(n)
+    reach = np.where(repeat_len >= min_len, positions + repeat_len, 0)
+    covered = np.maximum.accumulate(reach) > positions
+    return float(covered.mean())
+
+
+def track_refrains(lyrics: str, min_len: int = REFRAIN_MIN_TOKENS, top_n: int = 3) -> Dict[str, Any]:
+    words = tokenize(lyrics)
+    if not words:
+        return {"token_count": 0, "refrain_coverage": 0.0, "longest": [], "most_repeated": []}
+
+    _, ids = np.unique(words, return_inverse=True)
+    sa = suffix_array(ids)
+    lcp = lcp_array(ids, sa)
+
+    segments = []
+    for length, positions in repeated_segments(ids, sa, lcp, min_len):
+        segments.append({
+            "text": " ".join(words[positions[0]:positions[0] + length]),
+            "length": length,
+            "occurrences": len(positions),
+            "coverage": round(_covered_tokens(positions, length) / len(words), 4)
+        })
+
+    return {
+        "token_count": len(words),
+        "refrain_coverage": round(coverage_from_lcp(sa, lcp, min_len), 4),
+        "longest": sorted(segments, key=lambda s: (-s["length"], -s["occurrences"], s["text"]))[:top_n],
+        "most_repeated": sorted(segments, key=lambda s: (-s["occurrences"], -s["length"], s["text"]))[:top_n]
+    }
+
+
+def refrain_coverage(track: Dict[str, Any]) -> float:
+    words = tokenize(track["lyrics"])
+    if not words:
+        return 0.0
+    _, ids = np.unique(words, return_inverse=True)
+    sa = suffix_array(ids)
+    return round(coverage_from_lcp(sa, lcp_array(ids, sa)), 4)
+
+
+def analyze_refrains(data: List[Dict[str, Any]], top_n: int = 3) -> Dict[str, Any]:
+    tracks = []
+    by_album = defaultdict(list)
+    for track in data:
+        result = track_refrains(track["lyrics"], top_n=top_n)
+        tracks.append({"track": track["track_name"], "album": track["album_name"], **result})
+        by_album[track["album_name"]].append(result["refrain_coverage"])
+
+    order = [a for a in album_order() if a in by_album] + sorted(set(by_album) - set(album_order()))
+    return {
+        "min_tokens": REFRAIN_MIN_TOKENS,
+        "tracks": tracks,
+        "album_coverage": {a: round(sum(by_album[a]) / len(by_album[a]), 4) for a in order},
+        "most_refrain_driven": sorted(tracks, key=lambda t: -t["refrain_coverage"])[:5]
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("RADIOHEAD REFRAIN DETECTION")
+    print("=" * 70)
+
+    refrains = analyze_refrains(load_data())
+
+    print("\n--- REFRAIN COVERAGE BY ALBUM ---")
+    for album, coverage in refrains["album_coverage"].items():
+        print(f"  {album:<25} {coverage:.1%}")
+
+    print("\n--- MOST REFRAIN-DRIVEN TRACKS ---")
+    for t in refrains["most_refrain_driven"]:
+        top = t["most_repeated"][0] if t["most_repeated"] else None
+        hook = f'"{top["text"]}" x{top["occurrences"]}' if top else "-"
+        print(f"  {t['refrain_coverage']:<7} {t['track']:<32} {hook}")
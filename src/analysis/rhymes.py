@@ -0,0 +1,195 @@
+"""
+Rhyme and End-Sound Structure for Radiohead Lyrics.
+
+A heuristic, offline rhyme index over lyric lines (no pronunciation service):
+
+- Line-final words normalized to suffix rhyme keys: small orthographic to
+  rhyme-class tables ("ight" -> "it_e", "ea"/"ee" -> "ee", silent final e,
+  ...) with the key memoized per word
+- Lines grouped by rhyme key in a hash index
+- Rhyme density: share of lines that rhyme with one of the previous few lines
+- Scheme regularity: how consistently rhyming lines sit the same distance
+  apart (1 = couplets, 2 = alternating), plus the letter scheme itself
+
+Everything is a single pass over the lines, so cost is linear in lyric length.
+Line boundaries come from ingest's line_offsets; see processing/segmentation.py.
+Tracks without them are treated as a single line.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Any
+from collections import Counter, defaultdict
+
+from analysis.lexical_diversity import album_order, load_data
+from processing.segmentation import LyricSegments
+
+# Lines further apart than this are not treated as rhyming with each other
+RHYME_WINDOW = 4
+
+VOWELS = "aeiouy"
+
+# Words whose spelling misleads the suffix rules
+IRREGULAR_WORDS = {
+    "i": "i", "eye": "i", "you": "oo", "do": "oo", "to": "oo", "two": "oo",
+    "who": "oo", "through": "oo", "though": "o", "heart": "art"
+}
+
+# Plural -es only follows sibilants ("watches"); elsewhere just -s is dropped
+SIBILANT_ENDINGS = ("sh", "ch", "x", "z", "ss")
+
+# Orthographic endings that map straight to a rhyme class
+ENDING_CLASSES = [
+    ("ight", "it_e"), ("igh", "i"), ("ye", "i"), ("ew", "oo"), ("tion", "shun"), ("sion", "shun")
+]
+
+# Vowel spellings that sound alike at the end of a word (open syllable)...
+OPEN_VOWEL_CLASSES = {
+    "e": "ee", "ee": "ee", "ea": "ee", "ey": "ee", "i": "i", "ie": "i", "uy": "i",
+    "o": "o", "oe": "o", "ow": "o", "oo": "oo", "ou": "oo", "ue": "oo", "ew": "oo",
+    "ay": "ay", "ai": "ay", "ei": "ay"
+}
+
+# ...and before a final consonant
+CLOSED_VOWEL_CLASSES = {
+    "ee": "ee", "ea": "ee", "ie": "ee", "ai": "ay", "ei": "ay", "oa": "o", "oo": "oo"
+}
+
+
+@lru_cache(maxsize=None)
+def rhyme_key(word: str) -> str:
+    word = re.sub(r"[^a-z']", "", word.lower())
+    if word.endswith("in'"):
+        word = word[:-1] + "g"  # walkin' -> walking
+    word = word.replace("'", "")
+    if not word:
+        return ""
+    # Plurals and third-person -s rhyme with the bare word ("hearts" / "apart")
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"  # cries -> cry
+    elif word.endswith("es") and word[:-2].endswith(SIBILANT_ENDINGS):
+        word = word[:-2]  # watches -> watch
+    elif word.endswith("s") and len(word) > 3 and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]  # hearts -> heart
+    if word in IRREGULAR_WORDS:
+        return IRREGULAR_WORDS[word]
+    for ending, key in ENDING_CLASSES:
+        if word.endswith(ending):
+            return key
+
+    # Silent final e lengthens the vowel before it ("place" / "space")
+    magic_e = len(word) > 3 and word.endswith("e") and word[-2] not in VOWELS and word[-3] in VOWELS
+    core = word[:-1] if magic_e else word
+
+    # Final y after a consonant: long i in one-syllable words ("cry"), "ee" otherwise
+    if core.endswith("y") and len(core) > 1 and core[-2] not in VOWELS:
+        return "ee" if re.search(r"[aeiou]", core[:-1]) else "i"
+
+    match = re.search(r"([aeiouy]+)([^aeiouy]*)$", core)
+    if not match:
+        return core
+    vowel, coda = match.groups()
+    if magic_e:
+        return f"{vowel}{coda}_e"
+    if not coda:
+        return OPEN_VOWEL_CLASSES.get(vowel, vowel)
+    return CLOSED_VOWEL_CLASSES.get(vowel, vowel) + coda
+
+
+def track_segments(track: Dict[str, Any]) -> LyricSegments:
+    return LyricSegments.from_record(track)
+
+
+def line_final_words(segments: LyricSegments) -> List[str]:
+    finals = []
+    for line in segments.lines():
+        words = list(line.tokens())
+        if words:
+            finals.append(words[-1])
+    return finals
+
+
+def rhyme_structure(finals: List[str], window: int = RHYME_WINDOW) -> Dict[str, Any]:
+    keys = [rhyme_key(w) for w in finals]
+    index: Dict[str, List[int]] = defaultdict(list)
+    last_seen: Dict[str, int] = {}
+    rhyming = [False] * len(keys)
+    distances: Counter = Counter()
+    identical = 0
+
+    for i, key in enumerate(keys):
+        if key:
+            previous = last_seen.get(key)
+            if previous is not None and i - previous <= window:
+                rhyming[i] = rhyming[previous] = True
+                distances[i - previous] += 1
+                identical += finals[i] == finals[previous]
+            last_seen[key] = i
+            index[key].append(i)
+
+    # Letters for rhyme groups that recur, in order of first appearance
+    letters: Dict[str, str] = {}
+    scheme = []
+    for i, key in enumerate(keys):
+        if len(index.get(key, ())) > 1:
+            if key not in letters:
+                letters[key] = chr(ord("A") + len(letters) % 26)
+            scheme.append(letters[key])
+        else:
+            scheme.append("-")
+
+    pairs = sum(distances.values())
+    return {
+        "line_count": len(keys),
+        "rhyme_density": round(sum(rhyming) / len(keys), 4) if keys else 0.0,
+        # Undefined, not irregular, when nothing rhymes
+        "scheme_regularity": round(distances.most_common(1)[0][1] / pairs, 4) if pairs else None,
+        "dominant_distance": distances.most_common(1)[0][0] if pairs else None,
+        "identical_rhyme_share": round(identical / pairs, 4) if pairs else None,
+        "scheme": "".join(scheme),
+        "rhyme_groups": {k: [finals[i] for i in v] for k, v in index.items() if len(v) > 1}
+    }
+
+
+def rhyme_density(track: Dict[str, Any]) -> float:
+    return rhyme_structure(line_final_words(track_segments(track)))["rhyme_density"]
+
+
+def analyze_rhymes(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    tracks = []
+    by_album = defaultdict(list)
+    for track in data:
+        structure = rhyme_structure(line_final_words(track_segments(track)))
+        tracks.append({"track": track["track_name"], "album": track["album_name"], **structure})
+        by_album[track["album_name"]].append(structure)
+
+    order = [a for a in album_order() if a in by_album] + sorted(set(by_album) - set(album_order()))
+    albums = {}
+    for album in order:
+        rows = by_album[album]
+        # Tracks without any rhyme pair have no scheme to average
+        rhymed = [r for r in rows if r["scheme_regularity"] is not None]
+        albums[album] = {
+            "avg_rhyme_density": round(sum(r["rhyme_density"] for r in rows) / len(rows), 4),
+            "avg_scheme_regularity": round(sum(r["scheme_regularity"] for r in rhymed) / len(rhymed), 4) if rhymed else None,
+            "avg_identical_rhyme_share": round(sum(r["identical_rhyme_share"] for r in rhymed) / len(rhymed), 4) if rhymed else None,
+            "avg_line_count": round(sum(r["line_count"] for r in rows) / len(rows), 1)
+        }
+
+    return {"window": RHYME_WINDOW, "tracks": tracks, "albums": albums}
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("RADIOHEAD RHYME STRUCTURE")
+    print("=" * 70)
+
+    rhymes = analyze_rhymes(load_data())
+
+    print(f"\n{'Album':<22} {'Density':<9} {'Regularity':<11} {'Identical':<10} {'Lines':<6}")
+    print("-" * 70)
+    for album, m in rhymes["albums"].items():
+        print(f"{album:<22} {m['avg_rhyme_density']:<9} {m['avg_scheme_regularity']!s:<11} "
+              f"{m['avg_identical_rhyme_share']!s:<10} {m['avg_line_count']:<6}")
@@ -0,0 +1,128 @@
+"""
+Similar-Song Search for Radiohead Lyrics.
+
+TF-IDF vectors over the shared topic_modeling preprocessing, L2-normalized
+so that a sparse dot product is the cosine similarity:
+
+- most_similar(track, k): nearest tracks to a track in the corpus
+- search(text, k): nearest tracks to arbitrary lyrics or keywords
+- neighbor_lists(k): precomputed "songs like this" for the web export
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Any
+
+import numpy as np
+from scipy import sparse
+
+from analysis.topic_modeling import LyricCorpus, load_data, preprocess_tokens
+
+
+class SimilarityIndex:
+    def __init__(self, corpus: LyricCorpus) -> None:
+        self.corpus = corpus
+        n_docs, n_terms = corpus.n_docs, corpus.n_terms
+
+        counts = sparse.csr_matrix(
+            (corpus.count_data.astype(float), corpus.count_indices, corpus.count_indptr),
+            shape=(n_docs, n_terms)
+        )
+        # Smoothed idf, as in sklearn's TfidfTransformer
+        self.idf = np.log((1 + n_docs) / (1 + corpus.document_frequency())) + 1
+        self.vectors = self._normalize(counts @ sparse.diags(self.idf))
+
+    @classmethod
+    def from_data(cls, data: List[Dict[str, Any]]) -> "SimilarityIndex":
+        return cls(LyricCorpus(data))
+
+    @staticmethod
+    def _normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+    def _vectorize(self, texts: List[str]) -> sparse.csr_matrix:
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for word in preprocess_tokens(text):
+                term = self.corpus.term_index.get(word)
+                if term is not None:
+                    rows.append(row)
+                    cols.append(term)
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(texts), self.corpus.n_terms)
+        )
+        return self._normalize(counts @ sparse.diags(self.idf))
+
+    def _top_k(self, scores: np.ndarray, k: int, exclude: int | None = None) -> List[Dict[str, Any]]:
+        if exclude is not None:
+            scores = scores.copy()
+            scores[exclude] = -np.inf
+        k = min(k, len(scores) - (exclude is not None))
+        if k <= 0:
+            return []
+        # Partial selection, then sort only the k winners
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [
+            {
+                "track": self.corpus.track_names[i],
+                "album": self.corpus.album_names[i],
+                "score": round(float(scores[i]), 4)
+            }
+            for i in top
+            if scores[i] > 0
+        ]
+
+    def track_position(self, track: str | int) -> int:
+        if isinstance(track, int):
+            return track
+        return self.corpus.track_names.index(track)
+
+    def most_similar(self, track: str | int, k: int = 5) -> List[Dict[str, Any]]:
+        i = self.track_position(track)
+        scores = (self.vectors @ self.vectors[i].T).toarray().ravel()
+        return self._top_k(scores, k, exclude=i)
+
+    def search(self, text: str, k: int = 5) -> List[Dict[str, Any]]:
+        query = self._vectorize([text])
+        scores = (self.vectors @ query.T).toarray().ravel()
+        return self._top_k(scores, k)
+
+    def neighbor_lists(self, k: int = 5, block_size: int = 1024) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        # album -> track -> neighbors, so equal titles on different albums
+        # keep separate lists. Row blocks keep the dense score slab bounded
+        neighbors: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for start in range(0, self.corpus.n_docs, block_size):
+            block = (self.vectors[start:start + block_size] @ self.vectors.T).toarray()
+            for offset, scores in enumerate(block):
+                i = start + offset
+                album = neighbors.setdefault(self.corpus.album_names[i], {})
+                album[self.corpus.track_names[i]] = self._top_k(scores, k, exclude=i)
+        return neighbors
+
+
+def export_for_web(k: int = 5) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    return SimilarityIndex.from_data(load_data()).neighbor_lists(k)
+
+
+if __name__ == "__main__":
+    import sys
+
+    print("=" * 70)
+    print("RADIOHEAD SIMILAR SONGS")
+    print("=" * 70)
+
+    index = SimilarityIndex.from_data(load_data())
+
+    query = " ".join(sys.argv[1:])
+    if query and query in index.corpus.track_names:
+        results = index.most_similar(query)
+    else:
+        query = query or "rain"
+        results = index.search(query)
+
+    print(f"\n--- Closest to: {query} ---")
+    for r in results:
+        print(f"  {r['score']:<8} {r['track']} ({r['album']})")
@@ -0,0 +1,95 @@
+"""
+Streaming frequency sketches for very large lyric corpora.
+
+Space-Saving keeps at most `capacity` counters no matter how long the stream
+is. Every reported count overestimates the true count by at most
+total / capacity, and summaries built on separate shards can be merged
+without losing that guarantee.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int = 1000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        # Lazy min-heap of (count, item); stale entries are skipped on pop
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _push(self, item: Hashable) -> None:
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+    def update(self, item: Hashable, count: int = 1) -> None:
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # Replace the minimum counter; its count becomes the new item's error
+            evicted, min_count = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = min_count + count
+            self.errors[item] = min_count
+        self._push(item)
+
+    def extend(self, items: Iterable[Hashable]) -> None:
+        for item in items:
+            self.update(item)
+
+    @property
+    def error_bound(self) -> float:
+        # Maximum overestimate of any reported count
+        return self.total / self.capacity
+
+    def min_count(self) -> int:
+        # Upper bound on the count of any item that is not being tracked
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        ranked = sorted(self.counts.items(), key=lambda kv: -kv[1])[:n]
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        if self.capacity != other.capacity:
+            raise ValueError("Only summaries with the same capacity can be merged")
+
+        # Items missing from one summary may still have up to its min count
+        merged = SpaceSaving(self.capacity)
+        merged.total = self.total + other.total
+        floor_a, floor_b = self.min_count(), other.min_count()
+
+        combined = {}
+        for item in self.counts.keys() | other.counts.keys():
+            count = self.counts.get(item, floor_a) + other.counts.get(item, floor_b)
+            error = self.errors.get(item, floor_a) + other.errors.get(item, floor_b)
+            combined[item] = (count, error)
+
+        for item, (count, error) in sorted(combined.items(), key=lambda kv: -kv[1][0])[:merged.capacity]:
+            merged.counts[item] = count
+            merged.errors[item] = error
+        merged._heap = [(c, i) for i, c in merged.counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
@@ -8,17 +8,37 @@ Topic modeling across albums will test whether Radiohead's core concerns
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import copy
+import itertools
+import pickle
 import re
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, List, Any, Tuple
 from collections import defaultdict, Counter
 
+import numpy as np
+
+from analysis.sketches import SpaceSaving
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None  # type: ignore
+
 try:
-    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
     from sklearn.decomposition import LatentDirichletAllocation, NMF
+    from sklearn import __version__ as SKLEARN_VERSION
     SKLEARN_AVAILABLE = True
 except ImportError:
+    SKLEARN_VERSION = None
     SKLEARN_AVAILABLE = False
 
 
@@ -60,6 +80,17 @@ THEME_LABELS = {
 }
 
 
+# Fitted vectorizer/model pairs, keyed by corpus and hyperparameter hash
+MODEL_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "topic_models"
+ONLINE_MODEL_PATH = MODEL_CACHE_DIR / "online_lda.pkl"
+
+VECTORIZER_PARAMS = {
+    "max_features": 2000,
+    "min_df": 2,
+    "max_df": 0.95
+}
+
+
 def load_data(path: Path | None = None) -> List[Dict[str, Any]]:
     if path is None:
         path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
@@ -68,72 +99,439 @@ def load_data(path: Path | None = None) -> List[Dict[str, Any]]:
         return json.load(f)
 
 
-def preprocess_lyrics(text: str) -> str:
+def preprocess_tokens(text: str) -> List[str]:
     # Lowercase
     text = text.lower()
     # Remove punctuation
     text = re.sub(r"[^\w\s]", " ", text)
     # Remove numbers
     text = re.sub(r"\d+", "", text)
-    # Remove extra whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-    # Remove stop words
-    words = text.split()
-    words = [w for w in words if w not in STOP_WORDS and len(w) > 2]
-    return " ".join(words)
+    # Remove stop words (split() also collapses extra whitespace)
+    return [w for w in text.split() if w not in STOP_WORDS and len(w) > 2]
 
 
-def extract_keywords(data: List[Dict[str, Any]], top_n: int = 50) -> List[Tuple[str, int]]:
-    all_words = []
-    for track in data:
-        clean = preprocess_lyrics(track["lyrics"])
-        all_words.extend(clean.split())
+def preprocess_lyrics(text: str) -> str:
+    return " ".join(preprocess_tokens(text))
 
-    return Counter(all_words).most_common(top_n)
 
+class LyricCorpus:
+    """
+    Lyrics preprocessed once and shared by keyword extraction and topic models.
 
-def extract_keywords_by_album(data: List[Dict[str, Any]], top_n: int = 20) -> Dict[str, List[Tuple[str, int]]]:
-    by_album = defaultdict(list)
-    for track in data:
-        by_album[track["album_name"]].append(preprocess_lyrics(track["lyrics"]))
+    Tokens are stored as one flat array of term ids with per-track offsets.
+    Term ids follow first-occurrence order, so ties in the count-based
+    rankings break exactly as Counter.most_common would.
+    """
 
-    album_keywords = {}
-    for album, lyrics_list in by_album.items():
-        all_words = " ".join(lyrics_list).split()
-        album_keywords[album] = Counter(all_words).most_common(top_n)
+    def __init__(self, data: List[Dict[str, Any]]) -> None:
+        self.track_names = [t["track_name"] for t in data]
+        self.album_names = [t["album_name"] for t in data]
+        self.eras = [t.get("era", "") for t in data]
 
-    return album_keywords
+        self.term_index: Dict[str, int] = {}
+        ids: List[int] = []
+        offsets = [0]
+        for track in data:
+            for word in preprocess_tokens(track["lyrics"]):
+                ids.append(self.term_index.setdefault(word, len(self.term_index)))
+            offsets.append(len(ids))
 
+        self.vocabulary = list(self.term_index)
+        self.token_ids = np.asarray(ids, dtype=np.int64)
+        self.doc_offsets = np.asarray(offsets, dtype=np.int64)
+        self.doc_of_token = np.repeat(np.arange(len(data)), np.diff(self.doc_offsets))
 
-def run_lda(data: List[Dict[str, Any]], n_topics: int = 5) -> Dict[str, Any]:
-    if not SKLEARN_AVAILABLE:
-        return {"error": "sklearn not available"}
+        # Sparse (CSR) document-term counts from a single sort of the stream
+        n_terms = len(self.vocabulary)
+        keys, counts = np.unique(self.doc_of_token * n_terms + self.token_ids, return_counts=True)
+        self.count_indices = keys % n_terms if n_terms else keys
+        self.count_data = counts
+        self.count_indptr = np.searchsorted(keys, np.arange(len(data) + 1) * n_terms)
 
-    # Prepare corpus
-    corpus = [preprocess_lyrics(t["lyrics"]) for t in data]
-    track_names = [t["track_name"] for t in data]
-    album_names = [t["album_name"] for t in data]
-
-    # Create document-term matrix
-    vectorizer = CountVectorizer(
-        max_features=2000,
-        min_df=2,
-        max_df=0.95
-    )
-    dtm = vectorizer.fit_transform(corpus)
-    feature_names = vectorizer.get_feature_names_out()
+    @property
+    def n_docs(self) -> int:
+        return len(self.track_names)
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.vocabulary)
+
+    def tokens(self, doc: int) -> List[str]:
+        start, end = self.doc_offsets[doc], self.doc_offsets[doc + 1]
+        return [self.vocabulary[i] for i in self.token_ids[start:end]]
+
+    @property
+    def documents(self) -> List[str]:
+        return [" ".join(self.tokens(i)) for i in range(self.n_docs)]
+
+    def term_counts(self) -> np.ndarray:
+        return np.bincount(self.token_ids, minlength=self.n_terms)
+
+    def document_frequency(self) -> np.ndarray:
+        return np.bincount(self.count_indices, minlength=self.n_terms)
+
+    def group_labels(self, labels: List[str]) -> Tuple[List[str], np.ndarray]:
+        groups = list(dict.fromkeys(labels))
+        lookup = {g: i for i, g in enumerate(groups)}
+        return groups, np.array([lookup[l] for l in labels], dtype=np.int64)
+
+    def ranked_group_terms(
+        self,
+        top_n: int,
+        group_of_doc: np.ndarray | None = None,
+        weighting: str = "counts"
+    ) -> List[List[Tuple[int, float]]]:
+        # Per-group top terms as (term id, weight), ties broken by first
+        # occurrence in the group. "counts" reproduces Counter.most_common;
+        # "tfidf" down-weights terms that are common to every group.
+        if group_of_doc is None:
+            group_of_doc = np.zeros(self.n_docs, dtype=np.int64)
+        n_groups = int(group_of_doc.max()) + 1 if self.n_docs else 0
+        token_groups = group_of_doc[self.doc_of_token]
+
+        keys, first, counts = np.unique(
+            token_groups * self.n_terms + self.token_ids, return_index=True, return_counts=True
+        )
+        key_groups = keys // self.n_terms if self.n_terms else keys
+        key_terms = keys % self.n_terms if self.n_terms else keys
+
+        if weighting == "counts":
+            weights = counts.astype(float)
+        elif weighting == "tfidf":
+            # Smoothed idf over groups, as in sklearn's TfidfTransformer
+            group_df = np.bincount(key_terms, minlength=self.n_terms)
+            idf = np.log((1 + n_groups) / (1 + group_df)) + 1
+            weights = counts * idf[key_terms]
+        else:
+            raise ValueError(f"Unknown weighting: {weighting!r}")
+
+        order = np.lexsort((first, -weights, key_groups))
+        # Rank of each entry within its group, then keep the first top_n
+        group_starts = np.searchsorted(key_groups[order], np.arange(n_groups))
+        rank = np.arange(len(order)) - group_starts[key_groups[order]]
+        selected = order[rank < top_n]
+
+        ranked: List[List[Tuple[int, float]]] = [[] for _ in range(n_groups)]
+        for idx in selected:
+            ranked[key_groups[idx]].append((int(key_terms[idx]), float(weights[idx])))
+        return ranked
+
+    def top_terms(self, top_n: int, group_of_doc: np.ndarray | None = None) -> List[List[Tuple[str, int]]]:
+        # Per-group most_common(top_n)
+        return [
+            [(self.vocabulary[term], int(count)) for term, count in group]
+            for group in self.ranked_group_terms(top_n, group_of_doc)
+        ]
+
+    def document_term_matrix(
+        self,
+        min_df: int = 2,
+        max_df: float = 0.95,
+        max_features: int | None = None
+    ) -> Tuple[Any, np.ndarray]:
+        # Same pruning and alphabetical column order as CountVectorizer
+        from scipy import sparse
+
+        df = self.document_frequency()
+        max_doc_count = max_df if isinstance(max_df, int) else max_df * self.n_docs
+        min_doc_count = min_df if isinstance(min_df, int) else min_df * self.n_docs
+
+        names = np.array(self.vocabulary, dtype=object)
+        alphabetical = np.argsort(names)
+        keep = (df[alphabetical] >= min_doc_count) & (df[alphabetical] <= max_doc_count)
+        kept = alphabetical[keep]
+        if max_features is not None and len(kept) > max_features:
+            kept = kept[np.sort((-self.term_counts()[kept]).argsort()[:max_features])]
+
+        column = np.full(self.n_terms, -1, dtype=np.int64)
+        column[kept] = np.arange(len(kept))
+
+        # Entries for pruned terms map to column -1 and are dropped
+        mask = column[self.count_indices] >= 0
+        rows = np.repeat(np.arange(self.n_docs), np.diff(self.count_indptr))[mask]
+        dtm = sparse.csr_matrix(
+            (self.count_data[mask], (rows, column[self.count_indices][mask])),
+            shape=(self.n_docs, len(kept))
+        )
+        return dtm, names[kept]
+
+
+def extract_keywords(
+    data: List[Dict[str, Any]],
+    top_n: int = 50,
+    corpus: LyricCorpus | None = None
+) -> List[Tuple[str, int]]:
+    if corpus is None:
+        corpus = LyricCorpus(data)
+    return corpus.top_terms(top_n)[0] if corpus.n_docs else []
+
+
+def extract_keywords_by_album(
+    data: List[Dict[str, Any]],
+    top_n: int = 20,
+    corpus: LyricCorpus | None = None
+) -> Dict[str, List[Tuple[str, int]]]:
+    if corpus is None:
+        corpus = LyricCorpus(data)
+    albums, album_of_doc = corpus.group_labels(corpus.album_names)
+    return dict(zip(albums, corpus.top_terms(top_n, album_of_doc)))
+
+
+def keyword_overlap(
+    corpus: LyricCorpus,
+    labels: List[str] | None = None,
+    top_n: int = 25,
+    weighting: str = "counts"
+) -> Dict[str, Any]:
+    # Every pairwise keyword intersection from one sparse product: B is the
+    # binary group x term membership of each group's top-N keywords
+    groups, group_of_doc = corpus.group_labels(corpus.album_names if labels is None else labels)
+    ranked = corpus.ranked_group_terms(top_n, group_of_doc, weighting=weighting)
+
+    rows = np.repeat(np.arange(len(groups)), [len(r) for r in ranked])
+    cols = np.array([term for r in ranked for term, _ in r], dtype=np.int64)
+    values = np.array([weight for r in ranked for _, weight in r], dtype=float)
+
+    if sparse is not None:
+        membership = sparse.csr_matrix(
+            (np.ones(len(cols)), (rows, cols)), shape=(len(groups), corpus.n_terms)
+        )
+        weighted = sparse.csr_matrix((values, (rows, cols)), shape=(len(groups), corpus.n_terms))
+        intersections = np.asarray((membership @ membership.T).todense())
+        dots = np.asarray((weighted @ weighted.T).todense())
+        group_counts = np.asarray(membership.sum(axis=0)).ravel()
+    else:
+        membership = np.zeros((len(groups), corpus.n_terms))
+        membership[rows, cols] = 1.0
+        weighted = np.zeros((len(groups), corpus.n_terms))
+        weighted[rows, cols] = values
+        intersections = membership @ membership.T
+        dots = weighted @ weighted.T
+        group_counts = membership.sum(axis=0)
+
+    sizes = np.diag(intersections)
+    unions = sizes[:, None] + sizes[None, :] - intersections
+    jaccard = np.divide(intersections, unions, out=np.zeros_like(intersections), where=unions > 0)
+    norms = np.sqrt(np.diag(dots))
+    denom = np.outer(norms, norms)
+    cosine = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+    return {
+        "groups": groups,
+        "weighting": weighting,
+        "top_n": top_n,
+        "keywords": {
+            g: [(corpus.vocabulary[term], weight) for term, weight in r]
+            for g, r in zip(groups, ranked)
+        },
+        "jaccard": jaccard,
+        "weighted_cosine": cosine,
+        # Number of groups whose top-N keywords include each term
+        "term_group_counts": {
+            corpus.vocabulary[t]: int(group_counts[t]) for t in np.flatnonzero(group_counts)
+        }
+    }
+
+
+def overlap_as_dict(groups: List[str], matrix: np.ndarray, digits: int = 3) -> Dict[str, Dict[str, float]]:
+    return {
+        g1: {g2: round(float(matrix[i, j]), digits) for j, g2 in enumerate(groups)}
+        for i, g1 in enumerate(groups)
+    }
+
+
+# =============================================================================
+# STREAMING KEYWORDS
+# =============================================================================
+
+def keyword_sketches(tracks: Iterable[Dict[str, Any]], capacity: int = 1000) -> Dict[str, Any]:
+    # One pass with bounded memory; tracks can be any iterable (e.g. a JSON
+    # lines reader), so the corpus never has to be held in memory
+    overall = SpaceSaving(capacity)
+    by_album: Dict[str, SpaceSaving] = {}
+    for track in tracks:
+        words = preprocess_tokens(track["lyrics"])
+        album = by_album.setdefault(track["album_name"], SpaceSaving(capacity))
+        overall.extend(words)
+        album.extend(words)
+    return {"overall": overall, "by_album": by_album}
+
+
+def merge_keyword_sketches(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = shards[0]
+    for shard in shards[1:]:
+        by_album = dict(merged["by_album"])
+        for album, sketch in shard["by_album"].items():
+            by_album[album] = by_album[album].merge(sketch) if album in by_album else sketch
+        merged = {"overall": merged["overall"].merge(shard["overall"]), "by_album": by_album}
+    return merged
+
+
+def _sketch_shard(tracks: List[Dict[str, Any]], capacity: int) -> Dict[str, Any]:
+    return keyword_sketches(tracks, capacity)
+
+
+# Tracks handed to a worker at a time when sketching in parallel
+STREAM_CHUNK_SIZE = 500
+
+
+def _track_chunks(tracks: Iterable[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    iterator = iter(tracks)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parallel_keyword_sketches(
+    tracks: Iterable[Dict[str, Any]],
+    capacity: int = 1000,
+    n_shards: int = 2,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_workers: int | None = None
+) -> Dict[str, Any]:
+    # Chunks are sketched by workers as they are read and folded into one
+    # running sketch; at most n_shards chunks are in flight, so memory stays
+    # bounded however long the stream is
+    merged: List[Dict[str, Any]] = []
+
+    def fold(sketch: Dict[str, Any]) -> None:
+        merged[:] = [merge_keyword_sketches(merged + [sketch])]
+
+    chunks = _track_chunks(tracks, chunk_size)
+    pending: Dict[Any, List[Dict[str, Any]]] = {}
+    unsent: List[List[Dict[str, Any]]] = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or min(n_shards, os.cpu_count() or 1)) as pool:
+            for chunk in chunks:
+                unsent = [chunk]
+                if len(pending) >= n_shards:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        fold(future.result())
+                        del pending[future]
+                pending[pool.submit(_sketch_shard, chunk, capacity)] = chunk
+                unsent = []
+            for future in as_completed(list(pending)):
+                fold(future.result())
+                del pending[future]
+    except (OSError, BrokenProcessPool):
+        # Redo whatever was in flight, then finish the stream serially
+        for chunk in itertools.chain(list(pending.values()), unsent, chunks):
+            fold(_sketch_shard(chunk, capacity))
+
+    return merged[0] if merged else keyword_sketches([], capacity)
+
+
+def stream_keywords(
+    tracks: Iterable[Dict[str, Any]] | List[Dict[str, Any]],
+    top_n: int = 50,
+    album_top_n: int = 20,
+    capacity: int = 1000,
+    n_shards: int = 1,
+    max_workers: int | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Dict[str, Any]:
+    if n_shards > 1:
+        sketch = parallel_keyword_sketches(tracks, capacity, n_shards, chunk_size, max_workers)
+    else:
+        sketch = keyword_sketches(tracks, capacity)
+
+    def ranked(s: SpaceSaving, n: int) -> List[Dict[str, Any]]:
+        return [{"term": term, "count": count, "max_overcount": error} for term, count, error in s.top(n)]
+
+    return {
+        "overall_keywords": ranked(sketch["overall"], top_n),
+        "album_keywords": {album: ranked(s, album_top_n) for album, s in sketch["by_album"].items()},
+        "capacity": capacity,
+        "total_tokens": sketch["overall"].total,
+        "error_bound": round(sketch["overall"].error_bound, 2),
+        "album_error_bounds": {
+            album: round(s.error_bound, 2) for album, s in sketch["by_album"].items()
+        }
+    }
+
+
+def model_cache_key(corpus: List[str], params: Dict[str, Any]) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    for doc in corpus:
+        digest.update(doc.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _load_cached_model(path: Path) -> Dict[str, Any] | None:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def _store_cached_model(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so concurrent processes never read a partial file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def fit_lda_cached(
+    corpus: LyricCorpus,
+    n_topics: int = 5,
+    random_state: int = 42,
+    max_iter: int = 20,
+    cache_dir: Path | None = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    # Pickled estimators are only safe to load under the sklearn that wrote them
+    params = {
+        "model": "lda",
+        "sklearn": SKLEARN_VERSION,
+        "vectorizer": VECTORIZER_PARAMS,
+        "n_topics": n_topics,
+        "random_state": random_state,
+        "max_iter": max_iter
+    }
+    key = model_cache_key(corpus.documents, params)
+    path = (cache_dir or MODEL_CACHE_DIR) / f"lda_{key}.pkl"
+
+    if use_cache:
+        cached = _load_cached_model(path)
+        if cached is not None:
+            return {**cached, "key": key, "cache_hit": True}
+
+    # Document-term matrix from the shared counts; the vectorizer is pinned
+    # to the same vocabulary so it can transform unseen lyrics later
+    dtm, feature_names = corpus.document_term_matrix(**VECTORIZER_PARAMS)
+    vectorizer = CountVectorizer(vocabulary=list(feature_names))
 
     # Fit LDA
     lda = LatentDirichletAllocation(
         n_components=n_topics,
-        random_state=42,
-        max_iter=20
+        random_state=random_state,
+        max_iter=max_iter
     )
     doc_topics = lda.fit_transform(dtm)
 
+    payload = {"vectorizer": vectorizer, "model": lda, "doc_topics": doc_topics}
+    if use_cache:
+        _store_cached_model(path, payload)
+
+    return {**payload, "key": key, "cache_hit": False}
+
+
+def summarize_topics(model: Any, feature_names: Any) -> List[Dict[str, Any]]:
     # Extract top words per topic
     topics = []
-    for idx, topic in enumerate(lda.components_):
+    for idx, topic in enumerate(model.components_):
         top_indices = topic.argsort()[-15:][::-1]
         top_words = [feature_names[i] for i in top_indices]
         topics.append({
@@ -142,17 +540,46 @@ def run_lda(data: List[Dict[str, Any]], n_topics: int = 5) -> Dict[str, Any]:
             "top_words": top_words,
             "word_weights": {feature_names[i]: round(topic[i], 4) for i in top_indices[:10]}
         })
+    return topics
+
+
+def track_topic_entry(track: str, album: str, distribution: np.ndarray) -> Dict[str, Any]:
+    return {
+        "track": track,
+        "album": album,
+        "dominant_topic": int(distribution.argmax()),
+        "topic_distribution": {f"topic_{j}": round(distribution[j], 4) for j in range(len(distribution))}
+    }
+
+
+def run_lda(
+    data: List[Dict[str, Any]],
+    n_topics: int = 5,
+    use_cache: bool = True,
+    corpus: LyricCorpus | None = None
+) -> Dict[str, Any]:
+    if not SKLEARN_AVAILABLE:
+        return {"error": "sklearn not available"}
+
+    # Prepare corpus
+    if corpus is None:
+        corpus = LyricCorpus(data)
+    track_names = corpus.track_names
+    album_names = corpus.album_names
+
+    # Reuses the persisted vectorizer and model when the corpus is unchanged
+    fitted = fit_lda_cached(corpus, n_topics=n_topics, use_cache=use_cache)
+    lda = fitted["model"]
+    doc_topics = fitted["doc_topics"]
+    feature_names = fitted["vectorizer"].get_feature_names_out()
+
+    topics = summarize_topics(lda, feature_names)
 
     # Get dominant topic per track
-    track_topics = []
-    for i, (track, album) in enumerate(zip(track_names, album_names)):
-        dominant = int(doc_topics[i].argmax())
-        track_topics.append({
-            "track": track,
-            "album": album,
-            "dominant_topic": dominant,
-            "topic_distribution": {f"topic_{j}": round(doc_topics[i][j], 4) for j in range(n_topics)}
-        })
+    track_topics = [
+        track_topic_entry(track, album, doc_topics[i])
+        for i, (track, album) in enumerate(zip(track_names, album_names))
+    ]
 
     # Aggregate by album
     album_topic_dist = defaultdict(lambda: defaultdict(list))
@@ -175,63 +602,383 @@ def run_lda(data: List[Dict[str, Any]], n_topics: int = 5) -> Dict[str, Any]:
     }
 
 
+# =============================================================================
+# TOPIC-COUNT SWEEP
+# =============================================================================
+
+SWEEP_TOPIC_GRID = (3, 4, 5, 6, 7, 8)
+SWEEP_SEEDS = (0, 1, 42)
+SWEEP_MODELS = ("lda", "nmf")
+COHERENCE_TOP_N = 10
+
+# Document-term matrix shipped once to each sweep worker
+_SWEEP_DTM = None
+
+
+def _init_sweep_worker(dtm: Any) -> None:
+    global _SWEEP_DTM
+    _SWEEP_DTM = dtm
+
+
+def _fit_sweep_candidate(model: str, n_topics: int, seed: int, max_iter: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    dtm = _SWEEP_DTM
+
+    if model == "lda":
+        estimator = LatentDirichletAllocation(
+            n_components=n_topics, random_state=seed, max_iter=max_iter
+        )
+        estimator.fit(dtm)
+        perplexity = float(estimator.perplexity(dtm))
+        reconstruction_err = None
+    else:
+        # NMF works better on TF-IDF weights of the same counts
+        estimator = NMF(n_components=n_topics, random_state=seed, max_iter=max_iter * 50, init="nndsvda")
+        estimator.fit(TfidfTransformer().fit_transform(dtm))
+        perplexity = None
+        reconstruction_err = float(estimator.reconstruction_err_)
+
+    top_word_ids = np.argsort(-estimator.components_, axis=1)[:, :COHERENCE_TOP_N]
+    return {
+        "model": model,
+        "n_topics": n_topics,
+        "seed": seed,
+        "top_word_ids": top_word_ids,
+        "perplexity": perplexity,
+        "reconstruction_err": reconstruction_err,
+        "seconds": time.perf_counter() - start
+    }
+
+
+def umass_coherence(top_word_ids: np.ndarray, co_doc: np.ndarray, doc_freq: np.ndarray) -> np.ndarray:
+    # Mean UMass coherence per topic: log((D(w_i, w_j) + 1) / D(w_j)) over
+    # ordered pairs where w_j ranks above w_i
+    n = top_word_ids.shape[1]
+    i_idx, j_idx = np.tril_indices(n, k=-1)
+    wi = top_word_ids[:, i_idx]
+    wj = top_word_ids[:, j_idx]
+    scores = np.log((co_doc[wi, wj] + 1.0) / np.maximum(doc_freq[wj], 1))
+    return scores.mean(axis=1)
+
+
+def sweep_topic_models(
+    data: List[Dict[str, Any]],
+    topic_grid: Tuple[int, ...] = SWEEP_TOPIC_GRID,
+    seeds: Tuple[int, ...] = SWEEP_SEEDS,
+    models: Tuple[str, ...] = SWEEP_MODELS,
+    max_iter: int = 20,
+    max_workers: int | None = None,
+    corpus: LyricCorpus | None = None
+) -> Dict[str, Any]:
+    if not SKLEARN_AVAILABLE:
+        return {"error": "sklearn not available"}
+
+    if corpus is None:
+        corpus = LyricCorpus(data)
+    dtm, feature_names = corpus.document_term_matrix(**VECTORIZER_PARAMS)
+
+    # Shared co-occurrence counts for every candidate's coherence score
+    presence = (dtm > 0).astype(np.float64)
+    co_doc = np.asarray((presence.T @ presence).todense())
+    doc_freq = np.diag(co_doc)
+
+    grid = [(m, k, seed) for m in models for k in topic_grid for seed in seeds]
+    if max_workers is None:
+        max_workers = min(len(grid), os.cpu_count() or 1)
+
+    fitted = []
+    if max_workers > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_sweep_worker, initargs=(dtm,)
+            ) as pool:
+                futures = [pool.submit(_fit_sweep_candidate, m, k, seed, max_iter) for m, k, seed in grid]
+                for future in as_completed(futures):
+                    fitted.append(future.result())
+        except (OSError, BrokenProcessPool):
+            fitted = []
+
+    if not fitted:
+        _init_sweep_worker(dtm)
+        fitted = [_fit_sweep_candidate(m, k, seed, max_iter) for m, k, seed in grid]
+
+    candidates = []
+    for result in fitted:
+        coherence = umass_coherence(result["top_word_ids"], co_doc, doc_freq)
+        candidates.append({
+            "model": result["model"],
+            "n_topics": result["n_topics"],
+            "seed": result["seed"],
+            "coherence_umass": round(float(coherence.mean()), 4),
+            "perplexity": round(result["perplexity"], 2) if result["perplexity"] is not None else None,
+            "reconstruction_err": (
+                round(result["reconstruction_err"], 4) if result["reconstruction_err"] is not None else None
+            ),
+            "seconds": round(result["seconds"], 3),
+            "topics": [
+                [str(feature_names[i]) for i in row]
+                for row in result["top_word_ids"]
+            ]
+        })
+
+    # Coherence is comparable across model families; perplexity breaks LDA ties
+    candidates.sort(key=lambda c: (
+        -c["coherence_umass"],
+        c["perplexity"] if c["perplexity"] is not None else float("inf"),
+        c["n_topics"], c["model"], c["seed"]
+    ))
+    lda_candidates = [c for c in candidates if c["model"] == "lda"]
+
+    return {
+        "grid": {"topic_counts": list(topic_grid), "seeds": list(seeds), "models": list(models)},
+        "vocabulary_size": len(feature_names),
+        "candidates": candidates,
+        "best": candidates[0] if candidates else None,
+        "best_lda_by_perplexity": (
+            min(lda_candidates, key=lambda c: c["perplexity"]) if lda_candidates else None
+        )
+    }
+
+
+# =============================================================================
+# ONLINE TOPIC MODEL
+# =============================================================================
+
+class IncrementalTopicModel:
+    """
+    LDA that folds new or corrected tracks in with online variational Bayes.
+
+    Starts from the (cached) batch model, then calls partial_fit on
+    mini-batches of new lyrics. Only the new tracks are transformed, and only
+    their albums' topic distributions are recomputed, so the cost follows the
+    size of the update rather than the size of the corpus. Words outside the
+    fitted vocabulary are ignored.
+    """
+
+    def __init__(self, vectorizer: Any, model: Any) -> None:
+        self.vectorizer = vectorizer
+        self.model = model
+        self.n_topics = model.n_components
+        self.track_topics: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.album_sums: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(self.n_topics))
+        self.album_counts: Dict[str, int] = defaultdict(int)
+        self.album_topic_distribution: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_data(
+        cls,
+        data: List[Dict[str, Any]],
+        n_topics: int = 5,
+        corpus: LyricCorpus | None = None
+    ) -> "IncrementalTopicModel":
+        if corpus is None:
+            corpus = LyricCorpus(data)
+        fitted = fit_lda_cached(corpus, n_topics=n_topics)
+        # Never mutate the model shared with the batch cache
+        online = cls(fitted["vectorizer"], copy.deepcopy(fitted["model"]))
+        for i, (track, album) in enumerate(zip(corpus.track_names, corpus.album_names)):
+            online._set_track(track, album, fitted["doc_topics"][i])
+        online._refresh_albums(set(corpus.album_names))
+        return online
+
+    def _set_track(self, track: str, album: str, distribution: np.ndarray) -> None:
+        key = (album, track)
+        if key in self.track_topics:
+            self._unset_track(key)
+        entry = track_topic_entry(track, album, distribution)
+        self.track_topics[key] = entry
+        # Album means average the rounded track values, as run_lda does
+        self.album_sums[album] += [entry["topic_distribution"][f"topic_{j}"] for j in range(self.n_topics)]
+        self.album_counts[album] += 1
+
+    def _unset_track(self, key: Tuple[str, str]) -> None:
+        entry = self.track_topics.pop(key)
+        album = entry["album"]
+        self.album_sums[album] -= [entry["topic_distribution"][f"topic_{j}"] for j in range(self.n_topics)]
+        self.album_counts[album] -= 1
+
+    def _refresh_albums(self, albums: set) -> None:
+        for album in albums:
+            count = self.album_counts.get(album, 0)
+            if count:
+                self.album_topic_distribution[album] = {
+                    f"topic_{j}": round(self.album_sums[album][j] / count, 4)
+                    for j in range(self.n_topics)
+                }
+            else:
+                self.album_topic_distribution.pop(album, None)
+
+    def fold_in(self, tracks: List[Dict[str, Any]], batch_size: int = 32) -> Dict[str, Any]:
+        if not tracks:
+            return {"new_tracks": 0, "affected_albums": [], "oov_rate": 0.0}
+
+        docs = [preprocess_tokens(t["lyrics"]) for t in tracks]
+        counts = self.vectorizer.transform([" ".join(d) for d in docs])
+        total_tokens = sum(len(d) for d in docs)
+        oov_rate = 1 - counts.sum() / total_tokens if total_tokens else 0.0
+
+        # Online VB: the learning rate decays with the number of updates seen
+        self.model.set_params(total_samples=max(len(self.track_topics) + len(tracks), 1))
+        for start in range(0, counts.shape[0], batch_size):
+            self.model.partial_fit(counts[start:start + batch_size])
+
+        distributions = self.model.transform(counts)
+        affected = set()
+        for track, distribution in zip(tracks, distributions):
+            self._set_track(track["track_name"], track["album_name"], distribution)
+            affected.add(track["album_name"])
+        self._refresh_albums(affected)
+
+        return {
+            "new_tracks": len(tracks),
+            "affected_albums": sorted(affected),
+            "oov_rate": round(float(oov_rate), 4)
+        }
+
+    def remove(self, tracks: List[Dict[str, Any]]) -> List[str]:
+        affected = set()
+        for track in tracks:
+            key = (track["album_name"], track["track_name"])
+            if key in self.track_topics:
+                self._unset_track(key)
+                affected.add(track["album_name"])
+        self._refresh_albums(affected)
+        return sorted(affected)
+
+    def results(self) -> Dict[str, Any]:
+        feature_names = self.vectorizer.get_feature_names_out()
+        return {
+            "n_topics": self.n_topics,
+            "topics": summarize_topics(self.model, feature_names),
+            "track_topics": list(self.track_topics.values()),
+            "album_topic_distribution": dict(self.album_topic_distribution),
+            "vocabulary_size": len(feature_names)
+        }
+
+    def save(self, path: Path = ONLINE_MODEL_PATH) -> None:
+        _store_cached_model(path, {
+            "vectorizer": self.vectorizer,
+            "model": self.model,
+            "track_topics": self.track_topics,
+            "album_sums": dict(self.album_sums),
+            "album_counts": dict(self.album_counts)
+        })
+
+    @classmethod
+    def load(cls, path: Path = ONLINE_MODEL_PATH) -> "IncrementalTopicModel | None":
+        state = _load_cached_model(path)
+        if state is None:
+            return None
+        online = cls(state["vectorizer"], state["model"])
+        online.track_topics = state["track_topics"]
+        online.album_sums.update(state["album_sums"])
+        online.album_counts.update(state["album_counts"])
+        online._refresh_albums(set(online.album_counts))
+        return online
+
+
+# =============================================================================
+# TOPIC INFERENCE
+# =============================================================================
+
+# n_topics -> fitted vectorizer/model, loaded once per process
+_INFERENCE_MODELS: Dict[int, Dict[str, Any]] = {}
+
+
+def load_topic_model(n_topics: int = 5, data: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
+    if data is None and n_topics in _INFERENCE_MODELS:
+        return _INFERENCE_MODELS[n_topics]
+
+    # Resolves to the persisted model for this corpus; fits only if none exists
+    fitted = fit_lda_cached(LyricCorpus(data if data is not None else load_data()), n_topics=n_topics)
+    if data is None:
+        _INFERENCE_MODELS[n_topics] = fitted
+    return fitted
+
+
+def infer_topics(
+    texts: List[str],
+    n_topics: int = 5,
+    batch_size: int = 256,
+    fitted: Dict[str, Any] | None = None
+) -> List[Dict[str, Any]]:
+    if not SKLEARN_AVAILABLE:
+        return [{"error": "sklearn not available"} for _ in texts]
+
+    if fitted is None:
+        fitted = load_topic_model(n_topics)
+    vectorizer, model = fitted["vectorizer"], fitted["model"]
+
+    results = []
+    for start in range(0, len(texts), batch_size):
+        batch = [preprocess_tokens(t) for t in texts[start:start + batch_size]]
+        counts = vectorizer.transform([" ".join(tokens) for tokens in batch])
+        # transform only: the topic space is never refit here
+        distributions = model.transform(counts)
+        known = np.asarray(counts.sum(axis=1)).ravel()
+
+        for tokens, distribution, n_known in zip(batch, distributions, known):
+            dominant = int(distribution.argmax())
+            results.append({
+                "dominant_topic": dominant,
+                "dominant_theme": THEME_LABELS.get(dominant, f"Topic {dominant}"),
+                "topic_distribution": {
+                    f"topic_{j}": round(float(distribution[j]), 4) for j in range(len(distribution))
+                },
+                "known_token_fraction": round(float(n_known) / len(tokens), 4) if tokens else 0.0
+            })
+
+    return results
+
+
 def test_h3_thematic_continuity(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Preprocess once for keywords and topic modeling
+    corpus = LyricCorpus(data)
+
     # Get overall keywords
-    overall_keywords = extract_keywords(data, top_n=30)
+    overall_keywords = extract_keywords(data, top_n=30, corpus=corpus)
 
     # Get keywords by album (wider net helps surface shared terms)
-    album_keywords = extract_keywords_by_album(data, top_n=25)
+    album_keywords = extract_keywords_by_album(data, top_n=25, corpus=corpus)
 
     # Run topic modeling
-    lda_results = run_lda(data, n_topics=5)
+    lda_results = run_lda(data, n_topics=5, corpus=corpus)
 
     # Calculate thematic overlap between albums
     # (percentage of shared top keywords)
-    albums = list(album_keywords.keys())
-    overlap_matrix = {}
-    overlap_values = []
-
-    for a1 in albums:
-        words1 = set(w for w, _ in album_keywords[a1])
-        overlap_matrix[a1] = {}
-        for a2 in albums:
-            words2 = set(w for w, _ in album_keywords[a2])
-            overlap = len(words1.intersection(words2)) / len(words1.union(words2))
-            overlap_matrix[a1][a2] = round(overlap, 3)
-            if a1 != a2:
-                overlap_values.append(overlap)
-
-    avg_keyword_overlap = round(sum(overlap_values) / len(overlap_values), 3) if overlap_values else 0.0
+    overlap = keyword_overlap(corpus, top_n=25)
+    albums = overlap["groups"]
+    jaccard = overlap["jaccard"]
+    overlap_matrix = overlap_as_dict(albums, jaccard)
+
+    off_diagonal = ~np.eye(len(albums), dtype=bool)
+    avg_keyword_overlap = round(float(jaccard[off_diagonal].mean()), 3) if off_diagonal.any() else 0.0
 
     # Adjacent-album overlap for continuity check
     order = [
         "Pablo Honey", "The Bends", "OK Computer", "Kid A", "Amnesiac",
         "Hail to the Thief", "In Rainbows", "The King of Limbs", "A Moon Shaped Pool"
     ]
-    adjacent_overlaps = []
-    for a1, a2 in zip(order, order[1:]):
-        if a1 in album_keywords and a2 in album_keywords:
-            words1 = set(w for w, _ in album_keywords[a1])
-            words2 = set(w for w, _ in album_keywords[a2])
-            overlap = len(words1.intersection(words2)) / len(words1.union(words2))
-            adjacent_overlaps.append(overlap)
+    position = {album: i for i, album in enumerate(albums)}
+    adjacent_overlaps = [
+        jaccard[position[a1], position[a2]]
+        for a1, a2 in zip(order, order[1:])
+        if a1 in position and a2 in position
+    ]
 
     adjacent_overlap_avg = (
-        round(sum(adjacent_overlaps) / len(adjacent_overlaps), 3)
+        round(float(sum(adjacent_overlaps) / len(adjacent_overlaps)), 3)
         if adjacent_overlaps
         else 0.0
     )
 
-    # Find consistent themes across all albums
-    consistent_words = set(w for w, _ in album_keywords[albums[0]])
-    for album in albums[1:]:
-        consistent_words &= set(w for w, _ in album_keywords[album])
+    # Era-level overlap from the same engine
+    era_overlap = keyword_overlap(corpus, labels=corpus.eras, top_n=25)
 
-    # Find recurring terms across a majority of albums
-    term_counts = defaultdict(int)
-    for album, keywords in album_keywords.items():
-        for term, _ in keywords:
-            term_counts[term] += 1
+    # Find consistent themes across all albums, and recurring terms across
+    # a majority of albums, from per-term album counts
+    term_counts = overlap["term_group_counts"]
+    consistent_words = {term for term, count in term_counts.items() if count == len(albums)}
 
     threshold = max(3, len(albums) // 2)
     recurring_terms = sorted(
@@ -280,6 +1027,7 @@ def test_h3_thematic_continuity(data: List[Dict[str, Any]]) -> Dict[str, Any]:
         "keyword_overlap_matrix": overlap_matrix,
         "avg_keyword_overlap": avg_keyword_overlap,
         "adjacent_keyword_overlap_avg": adjacent_overlap_avg,
+        "era_keyword_overlap_matrix": overlap_as_dict(era_overlap["groups"], era_overlap["jaccard"]),
         "consistent_themes": list(consistent_words),
         "recurring_terms": recurring_terms,
         "recurring_terms_threshold": threshold,
@@ -292,9 +1040,10 @@ def test_h3_thematic_continuity(data: List[Dict[str, Any]]) -> Dict[str, Any]:
 def export_for_web() -> Dict[str, Any]:
     data = load_data()
 
-    keywords = extract_keywords(data, top_n=50)
-    album_keywords = extract_keywords_by_album(data, top_n=20)
-    lda = run_lda(data, n_topics=5)
+    corpus = LyricCorpus(data)
+    keywords = extract_keywords(data, top_n=50, corpus=corpus)
+    album_keywords = extract_keywords_by_album(data, top_n=20, corpus=corpus)
+    lda = run_lda(data, n_topics=5, corpus=corpus)
 
     return {
         "overall_keywords": keywords,
@@ -307,6 +1056,7 @@ def export_for_web() -> Dict[str, Any]:
 
 if __name__ == "__main__":
     import pprint
+    import sys
 
     print("=" * 70)
     print("RADIOHEAD TOPIC MODELING")
@@ -328,3 +1078,24 @@ if __name__ == "__main__":
         print("\n--- TOPICS ---")
         for topic in h3["topic_modeling"]["topics"]:
             print(f"\n  Topic {topic['topic_id']}: {', '.join(topic['top_words'][:8])}")
+
+    if "--infer" in sys.argv:
+        text = " ".join(sys.argv[sys.argv.index("--infer") + 1:])
+        print("\n--- TOPIC INFERENCE ---")
+        pprint.pprint(infer_topics([text])[0])
+
+    if "--stream" in sys.argv:
+        print("\n--- STREAMING KEYWORDS (SPACE-SAVING) ---")
+        streamed = stream_keywords(data, top_n=15, capacity=500, n_shards=4)
+        print(f"  error bound: +/-{streamed['error_bound']} over {streamed['total_tokens']} tokens")
+        for k in streamed["overall_keywords"]:
+            print(f"  {k['term']}: {k['count']} (max overcount {k['max_overcount']})")
+
+    if "--sweep" in sys.argv:
+        print("\n--- TOPIC-COUNT SWEEP ---")
+        sweep = sweep_topic_models(data)
+        for c in sweep["candidates"][:10]:
+            print(f"  {c['model']:<4} k={c['n_topics']} seed={c['seed']:<3} "
+                  f"coherence={c['coherence_umass']:<8} perplexity={c['perplexity']}")
+        best = sweep["best"]
+        print(f"\nBest: {best['model']} with {best['n_topics']} topics (seed {best['seed']})")
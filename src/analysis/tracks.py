@@ -0,0 +1,244 @@
+"""
+Compact Track Records for Large Lyric Corpora.
+
+A plain track dict carries ~40 keys, each numeric value boxed in its own
+Python float. Loading many artists into one process multiplies that cost, so
+TrackTable stores the corpus column-wise instead:
+
+- Numeric features live in one shared float64 matrix addressed by a column
+  schema; TrackTable.column() returns zero-copy views for vectorized code
+- Integer lists such as line and stanza offsets are concatenated into one
+  int32 buffer per field, sliced per track by a bounds array
+- Everything else (names, lyrics, mixed-type fields) is kept in per-column
+  lists, with repeated short strings such as album and era names shared
+  between tracks
+- Track is a read-only Mapping with __slots__, so existing t["metric"],
+  t.get(...) and `metric in t` code keeps working unchanged
+- to_dicts() reproduces the original records exactly, including key order,
+  missing keys and int vs float values
+
+On the current export this takes per-track overhead, lyrics excluded, from
+about 2.0 KB as dicts to about 0.7 KB, roughly 2.8x. Most of what remains is
+the float64 feature row, which is kept so values round-trip exactly; the
+lyric text itself is stored once either way.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Tuple
+
+import numpy as np
+
+
+# Integers above this are not exactly representable in a float64 column
+MAX_EXACT_INT = 2 ** 53
+
+# Integer lists are packed into int32 buffers when every element fits
+RAGGED_MIN = -2 ** 31
+RAGGED_MAX = 2 ** 31 - 1
+
+# Short strings (album names, eras, sources) repeat across tracks and are
+# shared rather than stored once per record
+SHARE_MAX_LENGTH = 64
+
+_MISSING = object()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _kind(value: Any) -> str | None:
+    if isinstance(value, float):
+        return "float"
+    if _is_number(value) and abs(value) <= MAX_EXACT_INT:
+        return "int"
+    if type(value) is list and all(
+        type(v) is int and RAGGED_MIN <= v <= RAGGED_MAX for v in value
+    ):
+        return "ragged"
+    return None
+
+
+def _shared(value: Any, seen: Dict[str, str]) -> Any:
+    # A per-table memo rather than sys.intern, so unique values such as track
+    # names don't accumulate in the interpreter-wide intern table
+    if type(value) is str and len(value) <= SHARE_MAX_LENGTH:
+        return seen.setdefault(value, value)
+    return value
+
+
+class _Layout:
+    """Key order shared by every track with the same set of fields."""
+
+    __slots__ = ("keys", "keyset")
+
+    def __init__(self, keys: Tuple[str, ...]) -> None:
+        self.keys = keys
+        self.keyset = frozenset(keys)
+
+
+class Track(Mapping):
+    __slots__ = ("_table", "_row", "_layout")
+
+    def __init__(self, table: "TrackTable", row: int, layout: _Layout) -> None:
+        self._table = table
+        self._row = row
+        self._layout = layout
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._layout.keyset:
+            raise KeyError(key)
+        table = self._table
+        row = self._row
+        col = table.numeric_index.get(key)
+        if col is not None:
+            value = table.features[row, col]
+            return int(value) if key in table.int_columns else float(value)
+        ragged = table.ragged.get(key)
+        if ragged is not None:
+            values, bounds = ragged
+            return values[bounds[row]:bounds[row + 1]].tolist()
+        return table.objects[table.object_index[key]][row]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout.keyset
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.keys)
+
+    def __len__(self) -> int:
+        return len(self._layout.keys)
+
+    def __repr__(self) -> str:
+        return f"Track({self.get('track_name')!r}, {self.get('album_name')!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self._layout.keys}
+
+
+class TrackTable:
+    def __init__(
+        self,
+        numeric_columns: List[str],
+        object_columns: List[str],
+        int_columns: set,
+        features: np.ndarray,
+        ragged: Dict[str, Tuple[np.ndarray, np.ndarray]] | None = None,
+        objects: List[List[Any]] | None = None
+    ) -> None:
+        self.numeric_columns = numeric_columns
+        self.object_columns = object_columns
+        self.numeric_index = {name: i for i, name in enumerate(numeric_columns)}
+        self.object_index = {name: i for i, name in enumerate(object_columns)}
+        self.int_columns = frozenset(int_columns)
+        self.features = features
+        # field -> (int32 values, int64 bounds); track i owns values[bounds[i]:bounds[i + 1]]
+        self.ragged = ragged if ragged is not None else {}
+        # One list per object column, indexed by row
+        self.objects = objects if objects is not None else [[] for _ in object_columns]
+        self.tracks: List[Track] = []
+        self._layouts: Dict[Tuple[str, ...], _Layout] = {}
+
+    @classmethod
+    def from_dicts(cls, records: List[Dict[str, Any]]) -> "TrackTable":
+        # A field is numeric only if every record that has it holds the same
+        # kind of number; anything mixed stays an object column so nothing is coerced
+        kinds: Dict[str, str | None] = {}
+        for record in records:
+            for key, value in record.items():
+                kind = _kind(value)
+                if kinds.setdefault(key, kind) != kind:
+                    kinds[key] = None
+
+        numeric_columns = [k for k, kind in kinds.items() if kind in ("float", "int")]
+        ragged_columns = [k for k, kind in kinds.items() if kind == "ragged"]
+        object_columns = [k for k, kind in kinds.items() if not kind]
+        int_columns = {k for k, kind in kinds.items() if kind == "int"}
+
+        features = np.full((len(records), len(numeric_columns)), np.nan)
+        ragged = {}
+        for key in ragged_columns:
+            lists = [record.get(key, ()) for record in records]
+            bounds = np.zeros(len(records) + 1, dtype=np.int64)
+            np.cumsum([len(values) for values in lists], out=bounds[1:])
+            values = np.fromiter(
+                (v for values in lists for v in values), dtype=np.int32, count=int(bounds[-1])
+            )
+            ragged[key] = (values, bounds)
+        seen: Dict[str, str] = {}
+        objects = [
+            [_shared(record.get(key, _MISSING), seen) for record in records] for key in object_columns
+        ]
+
+        table = cls(numeric_columns, object_columns, int_columns, features, ragged, objects)
+        for row, record in enumerate(records):
+            for key, value in record.items():
+                col = table.numeric_index.get(key)
+                if col is not None:
+                    features[row, col] = value
+            table.tracks.append(Track(table, row, table._layout(tuple(map(sys.intern, record)))))
+        return table
+
+    def _layout(self, keys: Tuple[str, ...]) -> _Layout:
+        layout = self._layouts.get(keys)
+        if layout is None:
+            layout = self._layouts[keys] = _Layout(keys)
+        return layout
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    def __iter__(self) -> Iterator[Track]:
+        return iter(self.tracks)
+
+    def __getitem__(self, index: int) -> Track:
+        return self.tracks[index]
+
+    def column(self, name: str) -> np.ndarray:
+        # Zero-copy view; NaN where a track lacks the field
+        return self.features[:, self.numeric_index[name]]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [track.to_dict() for track in self.tracks]
+
+
+def load_tracks(path: Path | None = None) -> TrackTable:
+    if path is None:
+        path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+
+    with open(path, "r", encoding="utf-8") as f:
+        return TrackTable.from_dicts(json.load(f))
+
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    print("=" * 70)
+    print("RADIOHEAD TRACK RECORDS")
+    print("=" * 70)
+
+    path = Path(__file__).resolve().parents[2] / "data" / "exports" / "radiohead_complete.json"
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+
+    tracemalloc.start()
+    records = json.loads(raw)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    table = TrackTable.from_dicts(records)
+    lyric_bytes = sum(sys.getsizeof(r["lyrics"]) for r in records)
+    del records
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(
+        f"\n{len(table)} tracks, {len(table.numeric_columns)} numeric / "
+        f"{len(table.ragged)} integer-list / {len(table.object_columns)} object columns"
+    )
+    print(f"  dicts:  {(dict_bytes - lyric_bytes) / len(table):,.0f} bytes per track (excluding lyrics)")
+    print(f"  tables: {(table_bytes - lyric_bytes) / len(table):,.0f} bytes per track (excluding lyrics)")
+    print(f"  round trip lossless: {table.to_dicts() == json.loads(raw)}")
@@ -0,0 +1,160 @@
+"""
+Vocabulary Growth and Novelty Across the Discography.
+
+Answers "did the vocabulary fragment?" by walking every track in release
+order with an incremental vocabulary:
+
+- New words each album introduces, and its novelty index (new / album types)
+- Words each album retires (never sung again on a later album)
+- Heaps' law V = K * N^beta fitted to vocabulary size vs tokens, with each
+  album's local growth exponent and its deviation from the global fit
+
+One streaming pass records per-word first-seen and last-seen album indexes,
+so the cost is linear in corpus size.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Any, Tuple
+from collections import Counter
+
+import numpy as np
+
+from analysis.lexical_diversity import album_order, load_data, tokenize
+
+
+def chronological_tracks(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Release year, then canonical album order; tracks keep their listed order
+    rank = {album: i for i, album in enumerate(album_order())}
+    indexed = sorted(
+        enumerate(data),
+        key=lambda it: (it[1]["album_year"], rank.get(it[1]["album_name"], len(rank)), it[1]["album_name"], it[0])
+    )
+    return [track for _, track in indexed]
+
+
+def vocabulary_pass(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Single pass over the tokens: first/last-seen indexes and the growth curve."""
+    albums: List[str] = []
+    years: List[int] = []
+    first_seen: Dict[str, int] = {}
+    last_seen: Dict[str, int] = {}
+    album_counts: List[Counter] = []
+    tokens_seen, curve_tokens, curve_types = 0, [], []
+
+    for track in chronological_tracks(data):
+        if not albums or albums[-1] != track["album_name"]:
+            albums.append(track["album_name"])
+            years.append(track["album_year"])
+            album_counts.append(Counter())
+        album_idx = len(albums) - 1
+        counts = album_counts[album_idx]
+
+        for word in tokenize(track["lyrics"]):
+            tokens_seen += 1
+            counts[word] += 1
+            if word not in first_seen:
+                first_seen[word] = album_idx
+            last_seen[word] = album_idx
+            curve_tokens.append(tokens_seen)
+            curve_types.append(len(first_seen))
+
+    return {
+        "albums": albums,
+        "years": years,
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+        "album_counts": album_counts,
+        "curve_tokens": np.asarray(curve_tokens, dtype=float),
+        "curve_types": np.asarray(curve_types, dtype=float)
+    }
+
+
+def fit_heaps_law(tokens: np.ndarray, types: np.ndarray) -> Tuple[float, float]:
+    # Least squares on log V = log K + beta * log N
+    if len(tokens) < 2:
+        return 0.0, 0.0
+    beta, log_k = np.polyfit(np.log(tokens), np.log(types), 1)
+    return float(np.exp(log_k)), float(beta)
+
+
+def analyze_vocabulary_growth(data: List[Dict[str, Any]], top_n: int = 10) -> Dict[str, Any]:
+    state = vocabulary_pass(data)
+    albums, counts = state["albums"], state["album_counts"]
+    tokens, types = state["curve_tokens"], state["curve_types"]
+
+    new_by_album = [[] for _ in albums]
+    retired_by_album = [[] for _ in albums]
+    for word, idx in state["first_seen"].items():
+        new_by_album[idx].append(word)
+    for word, idx in state["last_seen"].items():
+        retired_by_album[idx].append(word)
+
+    k, beta = fit_heaps_law(tokens, types)
+
+    results = []
+    end = 0
+    for i, album in enumerate(albums):
+        start, end = end, end + sum(counts[i].values())
+        album_types = len(counts[i])
+        new_words = new_by_album[i]
+
+        # Local exponent over this album's stretch of the growth curve
+        local_beta = None
+        if start > 0 and end - start >= 2:
+            local_beta = round(float(
+                np.log(types[end - 1] / types[start - 1]) / np.log(tokens[end - 1] / tokens[start - 1])
+            ), 4)
+        expected = k * tokens[end - 1] ** beta if end else 0.0
+
+        results.append({
+            "album": album,
+            "year": state["years"][i],
+            "tokens": end - start,
+            "types": album_types,
+            "new_words": len(new_words),
+            "novelty_index": round(len(new_words) / album_types, 4) if album_types else 0.0,
+            # The last album has no later albums to retire words against
+            "retired_words": len(retired_by_album[i]) if i < len(albums) - 1 else None,
+            "cumulative_vocabulary": int(types[end - 1]) if end else 0,
+            "heaps_expected_vocabulary": round(float(expected), 1),
+            "heaps_residual": round(float(types[end - 1] - expected), 1) if end else 0.0,
+            "local_heaps_beta": local_beta,
+            "top_new_words": [w for w, _ in Counter({w: counts[i][w] for w in new_words}).most_common(top_n)],
+            "top_retired_words": (
+                [w for w, _ in Counter({w: counts[i][w] for w in retired_by_album[i]}).most_common(top_n)]
+                if i < len(albums) - 1 else []
+            )
+        })
+
+    return {
+        "albums": results,
+        "heaps_law": {"k": round(k, 4), "beta": round(beta, 4)},
+        "total_tokens": int(tokens[-1]) if len(tokens) else 0,
+        "total_vocabulary": int(types[-1]) if len(types) else 0,
+        # Everything is new on the debut, so it is left out of the comparison
+        "most_novel_album": (
+            max(results[1:], key=lambda r: r["novelty_index"])["album"] if len(results) > 1 else None
+        )
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("RADIOHEAD VOCABULARY GROWTH")
+    print("=" * 70)
+
+    growth = analyze_vocabulary_growth(load_data())
+    heaps = growth["heaps_law"]
+
+    print(f"\nHeaps' law: V = {heaps['k']} * N^{heaps['beta']}  "
+          f"({growth['total_vocabulary']} words over {growth['total_tokens']} tokens)\n")
+    print(f"{'Album':<22} {'New':<6} {'Novelty':<9} {'Retired':<9} {'Local b':<9} {'Residual':<9}")
+    print("-" * 70)
+    for a in growth["albums"]:
+        retired = a["retired_words"] if a["retired_words"] is not None else "-"
+        local = a["local_heaps_beta"] if a["local_heaps_beta"] is not None else "-"
+        print(f"{a['album']:<22} {a['new_words']:<6} {a['novelty_index']:<9} {retired!s:<9} "
+              f"{local!s:<9} {a['heaps_residual']:<9}")
+
+    print(f"\nMost novel album: {growth['most_novel_album']}")
@@ -0,0 +1,331 @@
+"""
+Co-occurrence Word Vectors for Radiohead Lyrics.
+
+A local, dependency-light embedding model built from the lyric corpus alone:
+
+- Windowed co-occurrence counts from one chunked pass over the token ids,
+  summed into a sparse counter as it goes
+- Positive PMI with context-distribution smoothing
+- Truncated SVD, stored as a memory-mapped float32 matrix under data/cache
+- nearest_words(word, k) by cosine similarity
+- Per-era models to follow how words like "cold", "machine" or "rain" shift
+
+No network or GPU needed; the cache is keyed by the corpus and parameters.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from analysis.topic_modeling import LyricCorpus, load_data, model_cache_key
+
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import svds
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+VECTOR_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "word_vectors"
+
+DEFAULT_PARAMS = {
+    "window": 4,
+    "dim": 64,
+    "min_count": 2,
+    "context_alpha": 0.75,
+    "eigen_weight": 0.5
+}
+
+# Tokens processed per chunk of the co-occurrence pass
+STREAM_CHUNK = 1 << 16
+
+
+def _sum_by_key(keys: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=weights, minlength=len(unique))
+
+
+def cooccurrence_counts(
+    corpus: LyricCorpus,
+    window: int = 4,
+    term_map: np.ndarray | None = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Summed symmetric (row, col, weight) counts; pairs never cross track
+    boundaries. term_map renumbers terms, with -1 dropping a term entirely.
+    """
+    ids, docs = corpus.token_ids, corpus.doc_of_token
+    if term_map is not None:
+        ids = term_map[ids]
+    n_terms = max(int(ids.max()) + 1 if len(ids) else 0, 1)
+    n_tokens = len(ids)
+
+    # Running sparse counter of pair key -> weight. Chunk counts are buffered
+    # and folded in once they outgrow it, so memory follows the number of
+    # distinct pairs rather than the number of co-occurrences
+    counter_keys, counter_weights = np.empty(0, dtype=np.int64), np.empty(0)
+    buffered: List[Tuple[np.ndarray, np.ndarray]] = []
+    buffered_size = 0
+
+    def fold() -> Tuple[np.ndarray, np.ndarray]:
+        keys = np.concatenate([counter_keys] + [k for k, _ in buffered])
+        weights = np.concatenate([counter_weights] + [w for _, w in buffered])
+        return _sum_by_key(keys, weights)
+
+    # Chunks overlap by `window` tokens so pairs spanning a boundary are seen once
+    for start in range(0, n_tokens, STREAM_CHUNK):
+        stop = min(start + STREAM_CHUNK + window, n_tokens)
+        chunk_ids, chunk_docs = ids[start:stop], docs[start:stop]
+        anchors = min(STREAM_CHUNK, n_tokens - start)
+        keys, weights = [], []
+        for offset in range(1, window + 1):
+            n = min(anchors, len(chunk_ids) - offset)
+            if n <= 0:
+                break
+            left, right = chunk_ids[:n], chunk_ids[offset:offset + n]
+            keep = (chunk_docs[:n] == chunk_docs[offset:offset + n]) & (left >= 0) & (right >= 0)
+            left, right = left[keep], right[keep]
+            keys.extend([left * n_terms + right, right * n_terms + left])
+            # Harmonic weighting: closer neighbours count more
+            weights.append(np.full(2 * len(left), 1.0 / offset))
+
+        if keys:
+            buffered.append(_sum_by_key(np.concatenate(keys), np.concatenate(weights)))
+            buffered_size += len(buffered[-1][0])
+        if buffered and buffered_size >= len(counter_keys):
+            counter_keys, counter_weights = fold()
+            buffered, buffered_size = [], 0
+
+    if buffered:
+        counter_keys, counter_weights = fold()
+    return counter_keys // n_terms, counter_keys % n_terms, counter_weights
+
+
+def ppmi_matrix(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray,
+    n_terms: int,
+    context_alpha: float = 0.75
+) -> Any:
+    if SCIPY_AVAILABLE:
+        counts = sparse.coo_matrix((weights, (rows, cols)), shape=(n_terms, n_terms)).tocsr()
+        counts.sum_duplicates()
+        total = counts.sum()
+        word_p = np.asarray(counts.sum(axis=1)).ravel() / total
+        context = np.asarray(counts.sum(axis=0)).ravel() ** context_alpha
+        context_p = context / context.sum()
+
+        coo = counts.tocoo()
+        pmi = np.log(coo.data / total / (word_p[coo.row] * context_p[coo.col]))
+        keep = pmi > 0
+        return sparse.csr_matrix((pmi[keep], (coo.row[keep], coo.col[keep])), shape=(n_terms, n_terms))
+
+    counts = np.zeros((n_terms, n_terms))
+    np.add.at(counts, (rows, cols), weights)
+    total = counts.sum()
+    word_p = counts.sum(axis=1) / total
+    context = counts.sum(axis=0) ** context_alpha
+    context_p = context / context.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmi = np.log(counts / total / np.outer(word_p, context_p))
+    return np.where(np.isfinite(pmi) & (pmi > 0), pmi, 0.0)
+
+
+def truncated_svd(matrix: Any, dim: int, eigen_weight: float = 0.5) -> np.ndarray:
+    n = matrix.shape[0]
+    dim = max(1, min(dim, n - 1))
+    if SCIPY_AVAILABLE and sparse.issparse(matrix) and dim < n - 1:
+        u, s, _ = svds(matrix.astype(np.float64), k=dim, random_state=0)
+        order = np.argsort(-s)
+        u, s = u[:, order], s[order]
+    else:
+        dense = matrix.toarray() if SCIPY_AVAILABLE and sparse.issparse(matrix) else matrix
+        u, s, _ = np.linalg.svd(dense, full_matrices=False)
+        u, s = u[:, :dim], s[:dim]
+
+    # Fix sign so repeated fits produce identical vectors
+    signs = np.sign(u[np.abs(u).argmax(axis=0), np.arange(u.shape[1])])
+    signs[signs == 0] = 1.0
+    vectors = (u * signs) * s ** eigen_weight
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _store_vectors(key: str, vocabulary: List[str], vectors: np.ndarray, params: Dict[str, Any]) -> Path:
+    VECTOR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = VECTOR_CACHE_DIR / f"{key}.f32"
+
+    # Write then rename so concurrent readers never map a partial file
+    fd, tmp = tempfile.mkstemp(dir=VECTOR_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        out = np.memmap(tmp, dtype=np.float32, mode="w+", shape=vectors.shape)
+        out[:] = vectors
+        out.flush()
+        del out
+        os.replace(tmp, path)
+        meta = {"vocabulary": vocabulary, "shape": list(vectors.shape), "params": params}
+        with open(path.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def _load_vectors(key: str) -> Tuple[List[str], np.ndarray] | None:
+    path = VECTOR_CACHE_DIR / f"{key}.f32"
+    try:
+        with open(path.with_suffix(".json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        shape = tuple(meta["shape"])
+        if path.stat().st_size != int(np.prod(shape)) * 4:
+            return None
+        if not np.prod(shape):
+            return meta["vocabulary"], np.empty(shape, dtype=np.float32)
+        return meta["vocabulary"], np.memmap(path, dtype=np.float32, mode="r", shape=shape)
+    except (FileNotFoundError, KeyError, ValueError, json.JSONDecodeError):
+        return None
+
+
+class WordVectors:
+    def __init__(self, vocabulary: List[str], vectors: np.ndarray, cache_hit: bool = False) -> None:
+        self.vocabulary = vocabulary
+        self.index = {w: i for i, w in enumerate(vocabulary)}
+        self.vectors = vectors
+        self.cache_hit = cache_hit
+
+    @classmethod
+    def fit(
+        cls,
+        data: List[Dict[str, Any]],
+        use_cache: bool = True,
+        corpus: LyricCorpus | None = None,
+        **overrides: Any
+    ) -> "WordVectors":
+        params = {**DEFAULT_PARAMS, **overrides}
+        if corpus is None:
+            corpus = LyricCorpus(data)
+
+        key = model_cache_key(corpus.documents, {"model": "ppmi_svd", **params})
+        if use_cache:
+            cached = _load_vectors(key)
+            if cached is not None:
+                return cls(*cached, cache_hit=True)
+
+        # Drop rare words before the PMI step; they only add noise
+        keep = corpus.term_counts() >= params["min_count"]
+        remap = np.full(corpus.n_terms, -1, dtype=np.int64)
+        remap[keep] = np.arange(int(keep.sum()))
+        vocabulary = [w for w, k in zip(corpus.vocabulary, keep) if k]
+
+        rows, cols, weights = cooccurrence_counts(corpus, params["window"], term_map=remap)
+
+        if len(vocabulary) < 2 or not len(rows):
+            vectors = np.zeros((len(vocabulary), 0), dtype=np.float32)
+        else:
+            ppmi = ppmi_matrix(rows, cols, weights, len(vocabulary), params["context_alpha"])
+            vectors = truncated_svd(ppmi, params["dim"], params["eigen_weight"])
+
+        if use_cache:
+            _store_vectors(key, vocabulary, vectors, params)
+            cached = _load_vectors(key)
+            if cached is not None:
+                return cls(*cached)
+        return cls(vocabulary, vectors)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def similarity(self, a: str, b: str) -> float | None:
+        if a not in self.index or b not in self.index:
+            return None
+        return float(self.vectors[self.index[a]] @ self.vectors[self.index[b]])
+
+    def nearest_words(self, word: str, k: int = 10) -> List[Dict[str, Any]]:
+        i = self.index.get(word.lower())
+        if i is None or not self.vectors.shape[1]:
+            return []
+        # Rows are unit length, so the dot product is the cosine similarity
+        scores = np.asarray(self.vectors @ self.vectors[i], dtype=np.float64)
+        scores[i] = -np.inf
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [{"word": self.vocabulary[j], "similarity": round(float(scores[j]), 4)} for j in top]
+
+
+def era_order(data: List[Dict[str, Any]]) -> List[str]:
+    first_year: Dict[str, int] = {}
+    for track in data:
+        era = track.get("era", "")
+        first_year[era] = min(first_year.get(era, track.get("album_year", 0)), track.get("album_year", 0))
+    return sorted(first_year, key=lambda e: (first_year[e], e))
+
+
+def era_word_vectors(data: List[Dict[str, Any]], use_cache: bool = True, **overrides: Any) -> Dict[str, WordVectors]:
+    return {
+        era: WordVectors.fit([t for t in data if t.get("era", "") == era], use_cache=use_cache, **overrides)
+        for era in era_order(data)
+    }
+
+
+def meaning_shift(models: Dict[str, WordVectors], word: str, k: int = 10) -> Dict[str, Any]:
+    # Era spaces are fitted separately, so compare neighbourhoods, not raw vectors
+    neighbors = {era: [n["word"] for n in model.nearest_words(word, k)] for era, model in models.items()}
+    eras = [e for e in models if neighbors[e]]
+
+    overlaps = []
+    for a, b in zip(eras, eras[1:]):
+        sa, sb = set(neighbors[a]), set(neighbors[b])
+        overlaps.append({
+            "from": a,
+            "to": b,
+            "neighbor_jaccard": round(len(sa & sb) / len(sa | sb), 3),
+            "shared": sorted(sa & sb)
+        })
+
+    return {
+        "word": word,
+        "neighbors_by_era": {e: neighbors[e] for e in models},
+        "adjacent_overlap": overlaps
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    print("=" * 70)
+    print("RADIOHEAD WORD VECTORS (PPMI + SVD)")
+    print("=" * 70)
+
+    data = load_data()
+    words = sys.argv[1:] or ["cold", "machine", "rain"]
+
+    model = WordVectors.fit(data)
+    print(f"\n{len(model.vocabulary)} words x {model.vectors.shape[1]} dims (cache hit: {model.cache_hit})")
+
+    for word in words:
+        print(f"\n--- Nearest to '{word}' ---")
+        for n in model.nearest_words(word, 8):
+            print(f"  {n['similarity']:<8} {n['word']}")
+
+    print("\n--- MEANING ACROSS ERAS ---")
+    eras = era_word_vectors(data)
+    for word in words:
+        shift = meaning_shift(eras, word, 6)
+        print(f"\n  {word}")
+        for era, neighbors in shift["neighbors_by_era"].items():
+            print(f"    {era:<12} {', '.join(neighbors) or '-'}")
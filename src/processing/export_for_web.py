@@ -25,6 +25,7 @@ from analysis.the_wait import export_wait_data_for_web
 from analysis.setlist_archaeology import export_for_web as export_setlist
 from analysis.lexical_diversity import export_for_web as export_lexical
 from analysis.hypothesis_tests import generate_full_report
+from analysis.concordance import export_index
 
 
 def load_track_data() -> list:
@@ -136,6 +137,22 @@ def export_all():
         print(f"  Warning: Could not load lexical data: {e}")
         lexical_data = None
 
+    print("Building similar-song lists...")
+    try:
+        # Imported here: the index needs scipy, which the rest of the export does not
+        from analysis.similarity import SimilarityIndex
+        similar_tracks = SimilarityIndex.from_data(tracks).neighbor_lists(k=5)
+    except (KeyError, ValueError, ImportError) as e:
+        print(f"  Warning: Could not build similarity index: {e}")
+        similar_tracks = None
+
+    print("Building lyric concordance index...")
+    try:
+        index_path = export_index(tracks)
+    except (KeyError, OSError) as e:
+        print(f"  Warning: Could not build concordance index: {e}")
+        index_path = None
+
     print("Running hypothesis tests...")
     try:
         hypothesis_data = generate_full_report()
@@ -155,6 +172,7 @@ def export_all():
         "tracks": tracks,
         "albums": albums,
         "standout_tracks": standouts,
+        "similar_tracks": similar_tracks,
         "the_wait": wait_data,
         "tour_2025": setlist_data,
         "lexical_evolution": lexical_data,
@@ -240,6 +258,8 @@ def export_all():
     print(f"  - Tour 2025: {'Yes' if setlist_data else 'No'}")
     print(f"  - Lexical: {'Yes' if lexical_data else 'No'}")
     print(f"  - Hypothesis tests: {'Yes' if hypothesis_data else 'No'}")
+    print(f"  - Similar songs: {'Yes' if similar_tracks else 'No'}")
+    print(f"  - Concordance index: {index_path if index_path else 'No'}")
 
     return export
 
@@ -1,6 +1,10 @@
 """
 Ingest the Kaggle lyric CSV, clean metadata, and export JSON for analysis/web.
-Uses only the standard library so it can run in minimal environments.
+Uses only the standard library so it can run in minimal environments;
+near-duplicate lyric flagging runs when NumPy is installed.
+
+Line and stanza boundaries are kept as character offsets into the cleaned
+lyrics (line_offsets / stanza_offsets); see segmentation.py.
 """
 
 from __future__ import annotations
@@ -12,6 +16,12 @@ from pathlib import Path
 from typing import Dict, List
 
 from feature_extraction import compute_features
+from segmentation import LyricSegments, line_stats, segment_text
+
+try:
+    from near_duplicates import flag_near_duplicates
+except ImportError:
+    flag_near_duplicates = None
 
 # Canonical album metadata derived from README
 ALBUM_META: Dict[str, Dict[str, str | int]] = {
@@ -52,7 +62,7 @@ def normalize_rows(rows: List[dict]) -> List[dict]:
 
         album_name = strip_by_radiohead(album_raw)
         track_name = strip_by_radiohead(track_raw)
-        lyrics = clean_text(lyrics_raw)
+        lyrics, line_offsets, stanza_offsets = segment_text(lyrics_raw)
 
         if album_name not in ALBUM_META:
             raise ValueError(f"Unknown album: {album_name!r}")
@@ -61,6 +71,7 @@ def normalize_rows(rows: List[dict]) -> List[dict]:
         word_count = int(row.get("No_of_Words", 0) or 0)
 
         features = compute_features(lyrics)
+        structure = line_stats(LyricSegments(lyrics, line_offsets, stanza_offsets))
 
         normalized.append(
             {
@@ -69,9 +80,12 @@ def normalize_rows(rows: List[dict]) -> List[dict]:
                 "album_year": ALBUM_META[album_name]["year"],
                 "era": ALBUM_META[album_name]["era"],
                 "lyrics": lyrics,
+                "line_offsets": line_offsets.tolist(),
+                "stanza_offsets": stanza_offsets.tolist(),
                 "char_count": char_count,
                 "word_count": word_count,
                 **features,
+                **structure,
                 "source": "new_data_1.csv",
             }
         )
@@ -93,6 +107,13 @@ def main() -> None:
     rows = load_rows(raw_csv)
     records = normalize_rows(rows)
 
+    if flag_near_duplicates is not None:
+        for cluster in flag_near_duplicates(records):
+            names = ", ".join(
+                f"{records[i]['track_name']} ({records[i]['album_name']})" for i in cluster["members"]
+            )
+            print(f"Near-duplicate lyrics: {names}")
+
     write_json(records, export_json)
     write_json(records, web_json)
     print(f"Wrote {len(records)} records to {export_json} and {web_json}")
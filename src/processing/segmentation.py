@@ -0,0 +1,156 @@
+"""
+Line and stanza segmentation that survives whitespace cleaning.
+
+Cleaning collapses every whitespace run to one space, which used to throw away
+the lyric's structure. Here the runs are classified while the text is cleaned
+and kept as offset arrays into the cleaned string:
+
+- A single newline, or a double space in the flattened CSV lyrics: line break
+- A blank line, or three or more spaces: stanza break
+
+Segments are views over the original string (start/end offsets); tokenizing a
+line scans it in place with a bounded regex rather than copying it out.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-zA-Z']+")
+WHITESPACE_RUN = re.compile(r"\s+")
+
+NO_BREAK, LINE_BREAK, STANZA_BREAK = 0, 1, 2
+
+
+def classify_break(run: str) -> int:
+    newlines = run.count("\n")
+    if newlines >= 2:
+        return STANZA_BREAK
+    if newlines == 1:
+        return LINE_BREAK
+    if len(run) >= 3:
+        return STANZA_BREAK
+    if len(run) == 2:
+        return LINE_BREAK
+    return NO_BREAK
+
+
+def segment_text(value: str) -> Tuple[str, array, array]:
+    """
+    Clean text exactly as ingest's clean_text does, returning it with the
+    character offsets where each line and each stanza starts.
+    """
+    normalized = value.replace("\xa0", " ").replace("\r\n", "\n")
+    pieces: List[str] = []
+    line_starts = array("I")
+    stanza_starts = array("I")
+    length = 0
+    position = 0
+
+    for match in WHITESPACE_RUN.finditer(normalized):
+        word = normalized[position:match.start()]
+        position = match.end()
+        if not word:
+            continue  # leading whitespace
+        if not pieces:
+            line_starts.append(0)
+            stanza_starts.append(0)
+        pieces.append(word)
+        length += len(word)
+        if position == len(normalized):
+            break  # trailing whitespace
+
+        pieces.append(" ")
+        length += 1
+        kind = classify_break(match.group())
+        if kind != NO_BREAK:
+            line_starts.append(length)
+        if kind == STANZA_BREAK:
+            stanza_starts.append(length)
+
+    tail = normalized[position:]
+    if tail:
+        if not pieces:
+            line_starts.append(0)
+            stanza_starts.append(0)
+        pieces.append(tail)
+
+    return "".join(pieces), line_starts, stanza_starts
+
+
+class SegmentView:
+    """A line or stanza as offsets into the shared lyric string."""
+
+    __slots__ = ("text", "start", "end")
+
+    def __init__(self, text: str, start: int, end: int) -> None:
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __str__(self) -> str:
+        return self.text[self.start:self.end]
+
+    def __repr__(self) -> str:
+        return f"SegmentView({self.start}, {self.end})"
+
+    def tokens(self) -> Iterator[str]:
+        return (m.group().lower() for m in TOKEN_PATTERN.finditer(self.text, self.start, self.end))
+
+    def token_count(self) -> int:
+        return sum(1 for _ in TOKEN_PATTERN.finditer(self.text, self.start, self.end))
+
+
+class LyricSegments:
+    __slots__ = ("text", "line_starts", "stanza_starts")
+
+    def __init__(self, text: str, line_starts: array | List[int] | None = None, stanza_starts: array | List[int] | None = None) -> None:
+        self.text = text
+        # Unsegmented lyrics are a single line and a single stanza
+        default = [0] if text else []
+        self.line_starts = array("I", default if line_starts is None else line_starts)
+        self.stanza_starts = array("I", default if stanza_starts is None else stanza_starts)
+
+    @classmethod
+    def from_raw(cls, value: str) -> "LyricSegments":
+        return cls(*segment_text(value))
+
+    @classmethod
+    def from_record(cls, record: Dict[str, object]) -> "LyricSegments":
+        return cls(record["lyrics"], record.get("line_offsets"), record.get("stanza_offsets"))
+
+    def _views(self, starts: array) -> List[SegmentView]:
+        ends = list(starts[1:]) + [len(self.text) + 1]
+        # Each boundary is preceded by the single separating space
+        return [SegmentView(self.text, s, e - 1) for s, e in zip(starts, ends)]
+
+    def lines(self) -> List[SegmentView]:
+        return self._views(self.line_starts)
+
+    def stanzas(self) -> List[SegmentView]:
+        return self._views(self.stanza_starts)
+
+    def lines_by_stanza(self) -> List[List[SegmentView]]:
+        grouped: List[List[SegmentView]] = []
+        stanza_set = set(self.stanza_starts)
+        for line in self.lines():
+            if line.start in stanza_set or not grouped:
+                grouped.append([])
+            grouped[-1].append(line)
+        return grouped
+
+
+def line_stats(segments: LyricSegments) -> Dict[str, float | int]:
+    lengths = [line.token_count() for line in segments.lines()]
+    lengths = [n for n in lengths if n]
+    return {
+        "line_count": len(lengths),
+        "stanza_count": len(segments.stanza_starts),
+        "avg_line_length": round(sum(lengths) / len(lengths), 3) if lengths else 0.0,
+        "max_line_length": max(lengths) if lengths else 0,
+    }
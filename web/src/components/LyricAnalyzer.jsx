@@ -7,6 +7,7 @@ export default function LyricAnalyzer({ data, palettes }) {
   if (!data?.tracks) return null;
 
   const standouts = data.standout_tracks || {};
+  const similarTracks = data.similar_tracks || {};
   const lexical = data.lexical_evolution?.album_metrics || [];
 
   // Filter tracks by search
@@ -17,14 +18,22 @@ export default function LyricAnalyzer({ data, palettes }) {
       ).slice(0, 10)
     : [];
 
+  // Selection is { track, album }: titles alone are not unique
   const track = selectedTrack
-    ? data.tracks.find(t => t.track_name === selectedTrack)
+    ? data.tracks.find(t =>
+        t.track_name === selectedTrack.track && t.album_name === selectedTrack.album
+      )
     : null;
 
   const trackPalette = track
     ? palettes[track.album_name]
     : null;
 
+  // Neighbor lists are precomputed at export time (TF-IDF cosine)
+  const songsLikeThis = track
+    ? similarTracks[track.album_name]?.[track.track_name] || []
+    : [];
+
   return (
     <section className="panel analyzer-section">
       <div className="panel-header">
@@ -56,7 +65,7 @@ export default function LyricAnalyzer({ data, palettes }) {
                 key={`${t.track_name}-${t.album_name}`}
                 className="search-result"
                 onClick={() => {
-                  setSelectedTrack(t.track_name);
+                  setSelectedTrack({ track: t.track_name, album: t.album_name });
                   setSearchTerm(t.track_name);
                 }}
               >
@@ -182,6 +191,29 @@ export default function LyricAnalyzer({ data, palettes }) {
               {track.lyrics?.length > 500 && '...'}
             </p>
           </div>
+
+          {/* Songs Like This */}
+          {songsLikeThis.length > 0 && (
+            <div className="similar-songs">
+              <h4>Songs Like This</h4>
+              <div className="standout-list">
+                {songsLikeThis.map((t, i) => (
+                  <button
+                    key={`${t.track}-${t.album}`}
+                    className="standout-item"
+                    onClick={() => {
+                      setSelectedTrack({ track: t.track, album: t.album });
+                      setSearchTerm(t.track);
+                    }}
+                  >
+                    <span className="standout-rank">{i + 1}</span>
+                    <span className="standout-track">{t.track}</span>
+                    <span className="standout-album">{t.album}</span>
+                  </button>
+                ))}
+              </div>
+            </div>
+          )}
         </div>
       )}
 
@@ -199,7 +231,7 @@ export default function LyricAnalyzer({ data, palettes }) {
                       key={t.track}
                       className="standout-item"
                       onClick={() => {
-                        setSelectedTrack(t.track);
+                        setSelectedTrack({ track: t.track, album: t.album });
                         setSearchTerm(t.track);
                       }}
                     >